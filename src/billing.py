@@ -8,6 +8,7 @@ import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from .logging_config import get_logger
@@ -38,9 +39,20 @@ class SubscriptionStatus(Enum):
     INCOMPLETE = "incomplete"
 
 
-@dataclass
+# 機能を利用可能な状態（is_activeの呼び出し毎にリストを生成しないよう定数化）
+_ACTIVE_STATUSES = frozenset({SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING})
+
+# 使用量を記録する機能名とUsageMetricsのフィールドの対応
+_USAGE_FIELDS = {
+    "email_summary": "email_summaries_used",
+    "schedule_proposal": "schedule_proposals_used",
+    "action": "actions_executed",
+}
+
+
+@dataclass(frozen=True)
 class PlanLimits:
-    """プラン毎の制限"""
+    """プラン毎の制限（プラン毎に共有されるため不変）"""
     email_summaries_per_month: int
     schedule_proposals_per_month: int
     auto_actions_enabled: bool
@@ -48,6 +60,7 @@ class PlanLimits:
     priority_support: bool
 
     @classmethod
+    @lru_cache(maxsize=16)
     def for_plan(cls, plan: SubscriptionPlan) -> "PlanLimits":
         """プランに応じた制限を返す"""
         limits = {
@@ -90,14 +103,15 @@ class PlanLimits:
         return limits.get(plan, limits[SubscriptionPlan.FREE])
 
 
-@dataclass
+@dataclass(frozen=True)
 class PlanPricing:
-    """プラン価格"""
+    """プラン価格（プラン毎に共有されるため不変）"""
     monthly_price_cents: int  # セント単位
     annual_price_cents: int   # 年額（セント単位）
     currency: str = "usd"
 
     @classmethod
+    @lru_cache(maxsize=16)
     def for_plan(cls, plan: SubscriptionPlan) -> "PlanPricing":
         """プランに応じた価格を返す"""
         pricing = {
@@ -143,7 +157,7 @@ class Subscription:
 
     def is_active(self) -> bool:
         """アクティブなサブスクリプションか"""
-        return self.status in [SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING]
+        return self.status in _ACTIVE_STATUSES
 
     def get_limits(self) -> PlanLimits:
         """現在のプランの制限を取得"""
@@ -174,12 +188,9 @@ class Subscription:
         if not self.can_use_feature(feature):
             return False
 
-        if feature == "email_summary":
-            self.usage.email_summaries_used += 1
-        elif feature == "schedule_proposal":
-            self.usage.schedule_proposals_used += 1
-        elif feature == "action":
-            self.usage.actions_executed += 1
+        usage_field = _USAGE_FIELDS.get(feature)
+        if usage_field is not None:
+            setattr(self.usage, usage_field, getattr(self.usage, usage_field) + 1)
 
         return True
 
@@ -191,14 +202,20 @@ class BillingService:
     Stripe APIを使用したサブスクリプション管理
     """
 
-    def __init__(self, stripe_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        stripe_api_key: Optional[str] = None,
+        price_ids: Optional[dict[SubscriptionPlan, str]] = None
+    ):
         """
         初期化
 
         Args:
             stripe_api_key: Stripe APIキー（省略時は環境変数から取得）
+            price_ids: プラン毎のStripe価格ID（省略時は環境変数から取得）
         """
         self.stripe_api_key = stripe_api_key or os.getenv("STRIPE_API_KEY")
+        self._price_ids = price_ids
         self._stripe = None
         self._subscriptions: dict[str, Subscription] = {}  # ユーザーID -> サブスクリプション
 
@@ -319,11 +336,13 @@ class BillingService:
 
         try:
             # 価格IDのマッピング（実際にはStripe Dashboardで設定）
-            price_ids = {
-                SubscriptionPlan.PERSONAL: os.getenv("STRIPE_PRICE_PERSONAL"),
-                SubscriptionPlan.PRO: os.getenv("STRIPE_PRICE_PRO"),
-                SubscriptionPlan.TEAM: os.getenv("STRIPE_PRICE_TEAM"),
-            }
+            price_ids = self._price_ids
+            if price_ids is None:
+                price_ids = {
+                    SubscriptionPlan.PERSONAL: os.getenv("STRIPE_PRICE_PERSONAL"),
+                    SubscriptionPlan.PRO: os.getenv("STRIPE_PRICE_PRO"),
+                    SubscriptionPlan.TEAM: os.getenv("STRIPE_PRICE_TEAM"),
+                }
 
             price_id = price_ids.get(plan)
             if not price_id:
@@ -684,9 +703,34 @@ class MockBillingService(BillingService):
     """テスト用のモック課金サービス"""
 
     def __init__(self):
-        super().__init__(stripe_api_key=None)
+        super().__init__(price_ids={})
+        # 環境変数STRIPE_API_KEYの値を保持しない（常にモックモード）
+        self.stripe_api_key = None
         logger.info("MockBillingService初期化")
 
+    def _init_stripe(self):
+        """Stripe SDKを初期化しない（stripe.api_keyにも触れない）"""
+
+    def set_usage(self, user_id: str, feature: str, count: int) -> None:
+        """
+        使用量を直接設定
+
+        record_usageを繰り返さずに上限付近の状態を作るためのテスト用ヘルパー。
+
+        Args:
+            user_id: ユーザーID
+            feature: 機能名（email_summary, schedule_proposal, action）
+            count: 設定する使用回数
+
+        Raises:
+            KeyError: サブスクリプションがない場合
+            ValueError: 使用量を持たない機能名の場合
+        """
+        usage_field = _USAGE_FIELDS.get(feature)
+        if usage_field is None:
+            raise ValueError(f"使用量を持たない機能です: {feature}")
+        setattr(self._subscriptions[user_id].usage, usage_field, count)
+
 
 if __name__ == "__main__":
     from .logging_config import configure_logging
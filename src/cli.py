@@ -16,9 +16,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def print_banner():
-    """起動バナーを表示"""
-    banner = """
+# 起動バナー（モジュール読み込み時に1回だけ生成）
+_BANNER = """
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
 ║   ████████╗ █████╗ ███████╗██╗  ██╗                      ║
@@ -39,7 +38,36 @@ def print_banner():
 ║                                                           ║
 ╚═══════════════════════════════════════════════════════════╝
     """
-    print(banner)
+
+
+# コマンドライン使用方法（--help/-h で表示）
+_USAGE = """
+TaskMasterAI - AI-Powered Virtual Executive Assistant
+
+使用方法:
+  python -m src.cli              対話モードを起動
+  python -m src.cli auth         Google API認証を実行
+  python -m src.cli <command>    単一コマンドを実行
+
+コマンド例:
+  python -m src.cli inbox
+  python -m src.cli status
+  python -m src.cli "schedule meeting with alice@example.com 30min"
+
+詳細は 'help' コマンドで確認してください。
+"""
+
+_HELP_FLAGS = frozenset({"-h", "--help"})
+
+
+def build_banner() -> str:
+    """起動バナー文字列を返す"""
+    return _BANNER
+
+
+def print_banner():
+    """起動バナーを表示"""
+    print(build_banner())
 
 
 def interactive_mode():
@@ -124,23 +152,9 @@ def main():
     elif args[0] == "auth":
         # 認証モード
         sys.exit(auth_mode())
-    elif args[0] in ["-h", "--help"]:
+    elif args[0] in _HELP_FLAGS:
         # ヘルプ
-        print("""
-TaskMasterAI - AI-Powered Virtual Executive Assistant
-
-使用方法:
-  python -m src.cli              対話モードを起動
-  python -m src.cli auth         Google API認証を実行
-  python -m src.cli <command>    単一コマンドを実行
-
-コマンド例:
-  python -m src.cli inbox
-  python -m src.cli status
-  python -m src.cli "schedule meeting with alice@example.com 30min"
-
-詳細は 'help' コマンドで確認してください。
-""")
+        print(_USAGE)
     else:
         # 単一コマンドモード
         sys.exit(single_command_mode(args))
@@ -8,6 +8,7 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Callable
 from pathlib import Path
 
@@ -52,6 +53,43 @@ class CommandResult:
     pending_actions: Optional[list[Action]] = None
 
 
+@lru_cache(maxsize=128)
+def _parse_command(command: str) -> tuple[str, Optional[str]]:
+    """
+    コマンド文字列を正規化し、ルーティング先を判定
+
+    同じ文字列が繰り返し入力された場合はキャッシュから返す。
+
+    Args:
+        command: ユーザー入力コマンド
+
+    Returns:
+        (正規化済みコマンド, ルート名（不明なコマンドはNone）)
+    """
+    command = command.strip().lower()
+
+    if command.startswith("summarize inbox") or command == "inbox":
+        route = "inbox"
+    elif command.startswith("schedule"):
+        route = "schedule"
+    elif command == "status" or command == "today":
+        route = "status"
+    elif command.startswith("draft reply"):
+        route = "draft_reply"
+    elif command == "auth" or command == "auth status":
+        route = "auth"
+    elif command == "help":
+        route = "help"
+    elif command == "confirm":
+        route = "confirm"
+    elif command == "cancel":
+        route = "cancel"
+    else:
+        route = None
+
+    return command, route
+
+
 class Coordinator:
     """
     中央調整モジュール
@@ -106,7 +144,7 @@ class Coordinator:
             CommandResult
         """
         original_command = command
-        command = command.strip().lower()
+        command, route = _parse_command(command)
 
         logger.debug(
             "コマンド受信",
@@ -114,28 +152,28 @@ class Coordinator:
         )
 
         # コマンドのルーティング
-        if command.startswith("summarize inbox") or command == "inbox":
+        if route == "inbox":
             return self._handle_summarize_inbox()
 
-        elif command.startswith("schedule"):
+        elif route == "schedule":
             return self._handle_schedule_meeting(command)
 
-        elif command == "status" or command == "today":
+        elif route == "status":
             return self._handle_today_status()
 
-        elif command.startswith("draft reply"):
+        elif route == "draft_reply":
             return self._handle_draft_reply(command)
 
-        elif command == "auth" or command == "auth status":
+        elif route == "auth":
             return self._handle_auth_status()
 
-        elif command == "help":
+        elif route == "help":
             return self._handle_help()
 
-        elif command == "confirm":
+        elif route == "confirm":
             return self._handle_confirm()
 
-        elif command == "cancel":
+        elif route == "cancel":
             return self._handle_cancel()
 
         else:
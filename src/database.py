@@ -9,21 +9,48 @@ Note: Python 3.12以降、sqlite3のデフォルトdatetimeアダプターは非
 
 import logging
 import sqlite3
+import threading
+import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Literal, Optional, Generator
 import json
 
 logger = logging.getLogger(__name__)
 
+# 接続チューニング設定毎のPRAGMA
+# safe: SQLiteのデフォルト（journal_mode=DELETE, synchronous=FULL）
+# fast: WAL + synchronous=NORMALでcommit毎のfsyncを削減（テスト・一時DB向け）
+_TUNING_PRAGMAS: dict[str, tuple[str, ...]] = {
+    "safe": (),
+    "fast": (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+    ),
+}
+
+# 接続毎のプリペアドステートメントキャッシュ上限（sqlite3のデフォルトは128）
+# UPDATE文は更新列の組み合わせ毎にSQLが変わるため余裕を持たせる
+_CACHED_STATEMENTS = 512
+
 
 def _datetime_to_str(dt: datetime) -> str:
     """datetimeオブジェクトをISO8601文字列に変換（sqlite3警告回避）"""
     return dt.isoformat()
 
 
+def _next_month_start(dt: datetime) -> datetime:
+    """翌月1日0時を返す（12月は翌年1月）"""
+    if dt.month == 12:
+        return datetime(dt.year + 1, 1, 1)
+    return datetime(dt.year, dt.month + 1, 1)
+
+
 def _str_to_datetime(s: Optional[str]) -> datetime:
     """ISO8601文字列をdatetimeオブジェクトに変換"""
     if s is None:
@@ -34,7 +61,7 @@ def _str_to_datetime(s: Optional[str]) -> datetime:
         return datetime.now()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DBUser:
     """データベースユーザーモデル"""
     id: str
@@ -47,7 +74,7 @@ class DBUser:
     updated_at: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DBSubscription:
     """データベースサブスクリプションモデル"""
     id: str
@@ -61,7 +88,7 @@ class DBSubscription:
     updated_at: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DBUsageRecord:
     """使用量レコード"""
     id: str
@@ -79,20 +106,45 @@ class Database:
     ユーザー、サブスクリプション、使用量の永続化を提供
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        tuning: Literal["safe", "fast"] = "safe",
+        conn: Optional[sqlite3.Connection] = None
+    ):
         """
         初期化
 
         Args:
             db_path: データベースファイルパス（Noneの場合はインメモリ）
+            tuning: 接続チューニング（safe: デフォルト設定, fast: WAL等で書き込みを高速化）
+            conn: 共有する既存の接続（指定時はdb_pathより優先し、close()では閉じない）
         """
+        if tuning not in _TUNING_PRAGMAS:
+            raise ValueError(f"不明なtuning: {tuning}")
         self.db_path = db_path or ":memory:"
+        self.tuning = tuning
         # インメモリDBの場合は接続を保持（閉じるとデータが消える）
         self._persistent_conn: Optional[sqlite3.Connection] = None
-        if self.db_path == ":memory:":
+        # 接続を自前で開いたか（注入された接続は呼び出し側が閉じる）
+        self._owns_conn = conn is None
+        # 永続接続はスレッド間で共有するため、使用中（transaction()ブロック全体を含む）は排他する
+        self._conn_lock = threading.RLock()
+        if conn is not None:
+            self._persistent_conn = conn
+            self._persistent_conn.row_factory = sqlite3.Row
+            self._apply_pragmas(self._persistent_conn)
+        elif self.db_path == ":memory:":
             # check_same_thread=False: FastAPIの非同期処理でスレッド間共有を許可
-            self._persistent_conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._persistent_conn = sqlite3.connect(
+                ":memory:",
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS
+            )
             self._persistent_conn.row_factory = sqlite3.Row
+            self._apply_pragmas(self._persistent_conn)
+        # transaction()ブロック内で使用中の接続（ブロックを開いたスレッドのみ参照できる）
+        self._local = threading.local()
         self._init_database()
         logger.info(f"データベース初期化完了: {self.db_path}")
 
@@ -180,26 +232,108 @@ class Database:
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
         """データベース接続を取得"""
+        # transaction()ブロック内ではその接続を共有
+        if self._tx_conn is not None:
+            yield self._tx_conn
         # インメモリDBの場合は永続接続を使用
-        if self._persistent_conn is not None:
-            yield self._persistent_conn
+        elif self._persistent_conn is not None:
+            with self._conn_lock:
+                yield self._persistent_conn
         else:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, cached_statements=_CACHED_STATEMENTS)
             conn.row_factory = sqlite3.Row
+            self._apply_pragmas(conn)
             try:
                 yield conn
             finally:
                 conn.close()
 
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        """tuningに応じたPRAGMAを接続に適用"""
+        for pragma in _TUNING_PRAGMAS[self.tuning]:
+            conn.execute(pragma)
+
+    @property
+    def _tx_conn(self) -> Optional[sqlite3.Connection]:
+        """現在のスレッドで開いているtransaction()ブロックの接続"""
+        return getattr(self._local, "tx_conn", None)
+
+    @_tx_conn.setter
+    def _tx_conn(self, conn: Optional[sqlite3.Connection]) -> None:
+        self._local.tx_conn = conn
+
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        """transaction()ブロック外の場合のみcommit"""
+        if self._tx_conn is None:
+            conn.commit()
+
+    def _rollback(self, conn: sqlite3.Connection) -> None:
+        """transaction()ブロック外の場合のみrollback（失敗した文の暗黙トランザクションを閉じる）"""
+        if self._tx_conn is None:
+            conn.rollback()
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        複数の書き込みを1トランザクションにまとめる
+
+        ブロック内の各メソッドは個別にcommitせず、終了時に1回だけcommitする。
+        例外発生時はブロック内の変更をすべてロールバックする。
+        ブロック内で再度呼び出した場合はSAVEPOINTとして扱い、内側の変更のみ巻き戻す。
+        永続接続（インメモリDB・注入された接続）ではブロック終了まで他スレッドの操作を待たせる。
+
+        使用例:
+            with db.transaction():
+                for entry in entries:
+                    db.log_audit(**entry)
+        """
+        if self._tx_conn is not None:
+            with self._savepoint(self._tx_conn) as conn:
+                yield conn
+            return
+
+        with self._get_connection() as conn:
+            if conn.in_transaction:
+                # 他の操作が残した暗黙のトランザクションを確定してから開始
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            self._tx_conn = conn
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._tx_conn = None
+
+    @staticmethod
+    @contextmanager
+    def _savepoint(conn: sqlite3.Connection) -> Generator[sqlite3.Connection, None, None]:
+        """transaction()のネスト用SAVEPOINT"""
+        name = f"sp_{uuid.uuid4().hex}"
+        conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        except Exception:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+            raise
+        else:
+            conn.execute(f"RELEASE {name}")
+
     def close(self) -> None:
         """
         データベース接続をクローズ
 
         インメモリDBの永続接続を明示的に閉じる。
         テストのクリーンアップやアプリケーション終了時に呼び出す。
+        注入された接続は閉じずに参照のみ解放する。
         """
         if self._persistent_conn is not None:
-            self._persistent_conn.close()
+            if self._owns_conn:
+                self._persistent_conn.close()
             self._persistent_conn = None
             logger.debug("データベース接続をクローズしました")
 
@@ -227,28 +361,62 @@ class Database:
         """
         now = datetime.now()
         now_str = _datetime_to_str(now)
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+        with self._get_connection() as conn:
+            try:
+                conn.execute("""
                     INSERT INTO users (id, email, password_hash, name, plan, created_at, updated_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (user_id, email, password_hash, name, plan, now_str, now_str))
-                conn.commit()
+            except sqlite3.IntegrityError as e:
+                self._rollback(conn)
+                logger.warning(f"ユーザー作成エラー（重複）: {e}")
+                return None
+            self._commit(conn)
 
-                return DBUser(
-                    id=user_id,
-                    email=email,
-                    password_hash=password_hash,
-                    name=name,
-                    plan=plan,
-                    stripe_customer_id=None,
-                    created_at=now,
-                    updated_at=now
-                )
-        except sqlite3.IntegrityError as e:
-            logger.warning(f"ユーザー作成エラー（重複）: {e}")
-            return None
+        return DBUser(
+            id=user_id,
+            email=email,
+            password_hash=password_hash,
+            name=name,
+            plan=plan,
+            stripe_customer_id=None,
+            created_at=now,
+            updated_at=now
+        )
+
+    def create_users_bulk(
+        self,
+        rows: list[tuple[str, str, str, Optional[str]]],
+        plan: str = "free"
+    ) -> int:
+        """
+        ユーザーを一括作成
+
+        executemanyで1回のcommitにまとめる。重複があった場合は全件ロールバックする
+        （transaction()ブロック内では例外を送出し、ブロック全体をロールバックさせる）。
+
+        Args:
+            rows: (user_id, email, password_hash, name) のリスト
+            plan: 全ユーザーに設定するプラン
+
+        Returns:
+            作成件数（重複時は0）
+        """
+        now_str = _datetime_to_str(datetime.now())
+        with self._get_connection() as conn:
+            try:
+                conn.executemany("""
+                    INSERT INTO users (id, email, password_hash, name, plan, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, [(*row, plan, now_str, now_str) for row in rows])
+            except sqlite3.IntegrityError as e:
+                if self._tx_conn is not None:
+                    raise
+                conn.rollback()
+                logger.warning(f"ユーザー一括作成エラー（重複）: {e}")
+                return 0
+            self._commit(conn)
+            return len(rows)
 
     def get_user_by_id(self, user_id: str) -> Optional[DBUser]:
         """IDでユーザーを取得"""
@@ -306,7 +474,7 @@ class Database:
                 f"UPDATE users SET {', '.join(updates)} WHERE id = ?",
                 values
             )
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
 
     def _row_to_user(self, row: sqlite3.Row) -> DBUser:
@@ -336,38 +504,84 @@ class Database:
         """サブスクリプションを作成"""
         now = datetime.now()
         period_start = period_start or now
-        period_end = period_end or datetime(now.year, now.month + 1 if now.month < 12 else 1, 1)
+        period_end = period_end or _next_month_start(now)
 
         now_str = _datetime_to_str(now)
         period_start_str = _datetime_to_str(period_start)
         period_end_str = _datetime_to_str(period_end)
 
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+        with self._get_connection() as conn:
+            try:
+                conn.execute("""
                     INSERT INTO subscriptions
                     (id, user_id, plan, status, stripe_subscription_id,
                      current_period_start, current_period_end, created_at, updated_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (subscription_id, user_id, plan, status, stripe_subscription_id,
                       period_start_str, period_end_str, now_str, now_str))
-                conn.commit()
+            except sqlite3.IntegrityError as e:
+                self._rollback(conn)
+                logger.warning(f"サブスクリプション作成エラー: {e}")
+                return None
+            self._commit(conn)
 
-                return DBSubscription(
-                    id=subscription_id,
-                    user_id=user_id,
-                    plan=plan,
-                    status=status,
-                    stripe_subscription_id=stripe_subscription_id,
-                    current_period_start=period_start,
-                    current_period_end=period_end,
-                    created_at=now,
-                    updated_at=now
-                )
-        except sqlite3.IntegrityError as e:
-            logger.warning(f"サブスクリプション作成エラー: {e}")
-            return None
+        return DBSubscription(
+            id=subscription_id,
+            user_id=user_id,
+            plan=plan,
+            status=status,
+            stripe_subscription_id=stripe_subscription_id,
+            current_period_start=period_start,
+            current_period_end=period_end,
+            created_at=now,
+            updated_at=now
+        )
+
+    def create_subscriptions_bulk(
+        self,
+        rows: list[tuple[str, str, str]],
+        status: str = "active",
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None
+    ) -> int:
+        """
+        サブスクリプションを一括作成
+
+        期間のデフォルトはcreate_subscriptionと同じ。重複時の扱いはcreate_users_bulkと同じ。
+
+        Args:
+            rows: (subscription_id, user_id, plan) のリスト
+            status: 全件に設定するステータス
+            period_start: 期間開始
+            period_end: 期間終了
+
+        Returns:
+            作成件数（重複時は0）
+        """
+        now = datetime.now()
+        now_str = _datetime_to_str(now)
+        period_start_str = _datetime_to_str(period_start or now)
+        period_end_str = _datetime_to_str(period_end or _next_month_start(now))
+
+        with self._get_connection() as conn:
+            try:
+                conn.executemany("""
+                    INSERT INTO subscriptions
+                    (id, user_id, plan, status, current_period_start, current_period_end,
+                     created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (*row, status, period_start_str, period_end_str, now_str, now_str)
+                    for row in rows
+                ])
+            except sqlite3.IntegrityError as e:
+                if self._tx_conn is not None:
+                    raise
+                conn.rollback()
+                logger.warning(f"サブスクリプション一括作成エラー: {e}")
+                return 0
+            self._commit(conn)
+            return len(rows)
 
     def get_subscription_by_user(self, user_id: str) -> Optional[DBSubscription]:
         """ユーザーIDでサブスクリプションを取得"""
@@ -417,7 +631,7 @@ class Database:
                 f"UPDATE subscriptions SET {', '.join(updates)} WHERE id = ?",
                 values
             )
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
 
     def _row_to_subscription(self, row: sqlite3.Row) -> DBSubscription:
@@ -454,8 +668,6 @@ class Database:
         Returns:
             更新後のカウント
         """
-        import uuid
-
         period_start_str = _datetime_to_str(period_start)
         period_end_str = _datetime_to_str(period_end)
 
@@ -483,7 +695,7 @@ class Database:
                     VALUES (?, ?, ?, ?, ?, ?)
                 """, (str(uuid.uuid4()), user_id, feature, new_count, period_start_str, period_end_str))
 
-            conn.commit()
+            self._commit(conn)
             return new_count
 
     def get_usage(
@@ -514,7 +726,8 @@ class Database:
                 WHERE user_id = ? AND period_start = ?
             """, (user_id, period_start_str))
 
-            return {row["feature"]: row["count"] for row in cursor.fetchall()}
+            # (feature, count)の2列をそのまま辞書化
+            return dict(cursor.fetchall())
 
     # 監査ログ関連
     def log_audit(
@@ -531,7 +744,29 @@ class Database:
                 INSERT INTO audit_logs (user_id, action, details, ip_address)
                 VALUES (?, ?, ?, ?)
             """, (user_id, action, json.dumps(details) if details else None, ip_address))
-            conn.commit()
+            self._commit(conn)
+
+    def log_audit_many(self, entries: list[dict]) -> None:
+        """
+        監査ログを一括記録
+
+        Args:
+            entries: log_auditの引数（action, user_id, details, ip_address）の辞書のリスト
+        """
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO audit_logs (user_id, action, details, ip_address)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (
+                    entry.get("user_id"),
+                    entry["action"],
+                    json.dumps(entry["details"]) if entry.get("details") else None,
+                    entry.get("ip_address"),
+                )
+                for entry in entries
+            ])
+            self._commit(conn)
 
     def get_audit_logs(
         self,
@@ -544,25 +779,21 @@ class Database:
 
             if user_id:
                 cursor.execute("""
-                    SELECT * FROM audit_logs WHERE user_id = ?
+                    SELECT id, user_id, action, details, ip_address, created_at
+                    FROM audit_logs WHERE user_id = ?
                     ORDER BY id DESC LIMIT ?
                 """, (user_id, limit))
             else:
                 cursor.execute("""
-                    SELECT * FROM audit_logs ORDER BY id DESC LIMIT ?
+                    SELECT id, user_id, action, details, ip_address, created_at
+                    FROM audit_logs ORDER BY id DESC LIMIT ?
                 """, (limit,))
 
-            return [
-                {
-                    "id": row["id"],
-                    "user_id": row["user_id"],
-                    "action": row["action"],
-                    "details": json.loads(row["details"]) if row["details"] else None,
-                    "ip_address": row["ip_address"],
-                    "created_at": row["created_at"]
-                }
-                for row in cursor.fetchall()
-            ]
+            # sqlite3.Rowをdict()で変換し、detailsのみJSONデコードする
+            logs = [dict(row) for row in cursor.fetchall()]
+            for log in logs:
+                log["details"] = json.loads(log["details"]) if log["details"] else None
+            return logs
 
     # ベータ登録関連
     def add_beta_signup(
@@ -581,19 +812,19 @@ class Database:
             (成功フラグ, メッセージ)
         """
         email = email.lower().strip()
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+        with self._get_connection() as conn:
+            try:
+                conn.execute("""
                     INSERT INTO beta_signups (email, source)
                     VALUES (?, ?)
                 """, (email, source))
-                conn.commit()
-                logger.info(f"ベータ登録追加: {email}")
-                return True, "登録ありがとうございます！ベータ版の準備ができ次第ご連絡します。"
-        except sqlite3.IntegrityError:
-            logger.debug(f"ベータ登録重複: {email}")
-            return True, "既に登録済みです。ベータ版の準備ができ次第ご連絡します。"
+            except sqlite3.IntegrityError:
+                self._rollback(conn)
+                logger.debug(f"ベータ登録重複: {email}")
+                return True, "既に登録済みです。ベータ版の準備ができ次第ご連絡します。"
+            self._commit(conn)
+        logger.info(f"ベータ登録追加: {email}")
+        return True, "登録ありがとうございます！ベータ版の準備ができ次第ご連絡します。"
 
     def get_beta_signup_count(self) -> int:
         """ベータ登録者数を取得"""
@@ -614,15 +845,7 @@ class Database:
                 LIMIT ? OFFSET ?
             """, (limit, offset))
 
-            return [
-                {
-                    "email": row["email"],
-                    "created_at": row["created_at"],
-                    "source": row["source"],
-                    "status": row["status"]
-                }
-                for row in cursor.fetchall()
-            ]
+            return [dict(row) for row in cursor.fetchall()]
 
     def get_beta_emails(self) -> list[str]:
         """ベータ登録メールアドレス一覧を取得"""
@@ -640,17 +863,21 @@ class Database:
             return cursor.fetchone() is not None
 
 
-def create_database(db_path: Optional[str] = None) -> Database:
+def create_database(
+    db_path: Optional[str] = None,
+    tuning: Literal["safe", "fast"] = "safe"
+) -> Database:
     """
     データベースインスタンスを作成
 
     Args:
         db_path: データベースファイルパス
+        tuning: 接続チューニング（safe/fast）
 
     Returns:
         Databaseインスタンス
     """
-    return Database(db_path)
+    return Database(db_path, tuning=tuning)
 
 
 if __name__ == "__main__":
@@ -685,7 +912,7 @@ if __name__ == "__main__":
     # 使用量記録
     now = datetime.now()
     period_start = datetime(now.year, now.month, 1)
-    period_end = datetime(now.year, now.month + 1 if now.month < 12 else 1, 1)
+    period_end = _next_month_start(now)
 
     count = db.record_usage("test-user-1", "email_summary", period_start, period_end)
     print(f"使用量記録: {count}")
@@ -6,6 +6,7 @@ Gmail APIを使用してメールを取得し、LLMで要約を生成する
 
 import base64
 import json
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
@@ -423,11 +424,17 @@ class EmailBot:
             return None
 
 
+# 連続する空白・改行（summarize_text_offlineの正規化用）
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 # オフラインテスト用のヘルパー関数
 def summarize_text_offline(text: str, max_length: int = 200) -> str:
     """
     LLMなしでテキストを簡易要約（テスト用）
 
+    純粋関数のため、同じ入力の2回目以降はキャッシュから返す。
+
     Args:
         text: 要約対象のテキスト
         max_length: 最大文字数
@@ -436,8 +443,7 @@ def summarize_text_offline(text: str, max_length: int = 200) -> str:
         簡易要約文
     """
     # 改行や空白を正規化
-    import re
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
 
     # 最初のmax_length文字を抽出
     if len(text) <= max_length:
@@ -571,6 +571,12 @@ def find_free_slots_offline(
     """
     today = datetime.now().replace(hour=start_hour, minute=0, second=0, microsecond=0)
 
+    # 開始時刻順に並べ、候補枠と同じ向きに1回だけ走査する（O(n log n)）
+    sorted_busy = sorted(busy_slots, key=lambda slot: slot.start)
+    next_busy = 0
+    # 候補枠の終了より前に始まる予定の終了時刻の最大値
+    busy_until: Optional[datetime] = None
+
     free_slots = []
     current = today
 
@@ -580,11 +586,16 @@ def find_free_slots_offline(
         if slot_end.hour > end_hour:
             break
 
-        candidate = TimeSlot(current, slot_end)
-        is_free = all(not candidate.overlaps(busy) for busy in busy_slots)
+        # 候補枠は単調に進むため、一度取り込んだ予定は以降の候補でも対象のまま
+        while next_busy < len(sorted_busy) and sorted_busy[next_busy].start < slot_end:
+            busy_end = sorted_busy[next_busy].end
+            if busy_until is None or busy_end > busy_until:
+                busy_until = busy_end
+            next_busy += 1
 
-        if is_free:
-            free_slots.append(candidate)
+        # 開始が候補終了より前の予定のうち、候補開始より後に終わるものがあれば重複
+        if busy_until is None or busy_until <= current:
+            free_slots.append(TimeSlot(current, slot_end))
 
         current += timedelta(minutes=30)
 
@@ -7,8 +7,54 @@ Note: 警告フィルターはpytest.iniで設定
 """
 
 import gc
+import json
 import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# プロジェクトルートをimportパスに追加（セッションで1回だけ）
+_ROOT = str(Path(__file__).parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
 import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+from src.billing import (
+    BillingService,
+    Subscription,
+    SubscriptionPlan,
+    SubscriptionStatus,
+)
+from src.coordinator import Coordinator
+from src.database import Database
+from src.email_bot import Email, EmailBot
+from src.scheduler import Scheduler
+from src.auth import AuthManager
+from src.llm import LLMService
+
+
+# 共有DBでテスト毎に中身を消去するテーブル（外部キー参照元から順に）
+_DB_TABLES = ("audit_logs", "usage_records", "subscriptions", "users", "beta_signups")
+
+# テストセッションで共有する名前付きインメモリDB（ワーカープロセス内で共有キャッシュ）
+_SHARED_MEMORY_URI = "file:taskmaster_test?mode=memory&cache=shared"
+
+# テストDB専用のPRAGMA（耐久性は不要なためジャーナル書き込みと同期を省く）
+_TEST_DB_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
+_TZ_TOKYO = ZoneInfo("Asia/Tokyo")
 
 
 def pytest_configure(config):
@@ -35,3 +81,310 @@ def cleanup_db_connections():
     yield
     # テスト後にガベージコレクションを実行
     gc.collect()
+
+
+@pytest.fixture(scope="session")
+def _schema_db():
+    """
+    スキーマ初期化済みの共有インメモリDB
+
+    CREATE TABLE/INDEXはセッションで1回だけ実行する。
+    共有キャッシュURIの接続を1本だけ開き、Databaseに注入して使い回す。
+    接続はセッション終了まで保持するため、途中でDBが解放されることはない。
+    pytest-xdist実行時はワーカー毎のセッションになるため、DBもワーカー毎に独立する。
+    """
+    conn = sqlite3.connect(_SHARED_MEMORY_URI, uri=True, check_same_thread=False)
+    for pragma in _TEST_DB_PRAGMAS:
+        conn.execute(pragma)
+    database = Database(conn=conn)
+    yield database
+    database.close()
+    conn.close()
+
+
+@pytest.fixture
+def db(_schema_db: Database):
+    """
+    テスト用データベースフィクスチャ
+
+    共有インメモリDBを返し、テスト後に全テーブルを空にして分離する。
+    Databaseの各メソッドが都度commitするため、SAVEPOINT/ROLLBACKではなく
+    DELETEで後始末する。
+    """
+    yield _schema_db
+    with _schema_db._get_connection() as conn:
+        for table in _DB_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("DELETE FROM sqlite_sequence")
+        conn.commit()
+
+
+@pytest.fixture
+def ramdisk_path(tmp_path_factory):
+    """
+    ファイルDBテスト用の一時ディレクトリ
+
+    /dev/shm（tmpfs、環境変数RAMDISKで変更可）があればその上に作成し、
+    commit毎のfsyncをディスクI/Oにしない。ない環境（Windows/macOS）では通常の一時ディレクトリ。
+    """
+    ramdisk = Path(os.environ.get("RAMDISK", "/dev/shm"))
+    if not ramdisk.is_dir():
+        yield tmp_path_factory.mktemp("db")
+        return
+    path = Path(tempfile.mkdtemp(prefix="taskmaster-", dir=ramdisk))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def fixed_now() -> datetime:
+    """DBテストで共有する固定時刻（datetime.now()の代わり）"""
+    return datetime(2026, 6, 15, 12, 0, 0)
+
+
+@pytest.fixture(scope="session")
+def frozen_clock(fixed_now: datetime):
+    """
+    datetime.now()を固定するヘルパー
+
+    frozen_clock(monkeypatch, "src.database") のように呼び出すと、指定モジュールのdatetimeを
+    now()が固定時刻（既定はfixed_now）を返すサブクラスに差し替え、その時刻を返す。
+    module-scopeのフィクスチャからはpytest.MonkeyPatch.context()を渡す。
+    """
+    def freeze(monkeypatch: pytest.MonkeyPatch, *module_paths: str, now: datetime = fixed_now) -> datetime:
+        frozen = now
+
+        class _FrozenDatetime(datetime):
+            """now()が固定時刻を返すdatetime"""
+
+            @classmethod
+            def now(cls, tz=None):
+                return frozen.replace(tzinfo=tz)
+
+        for module_path in module_paths:
+            monkeypatch.setattr(f"{module_path}.datetime", _FrozenDatetime)
+        return frozen
+
+    return freeze
+
+
+@pytest.fixture(scope="session")
+def usage_period(fixed_now: datetime) -> tuple[datetime, datetime]:
+    """fixed_nowを含む月の使用量集計期間（月初, 翌月初）"""
+    period_start = fixed_now.replace(day=1, hour=0)
+    period_end = (period_start + timedelta(days=32)).replace(day=1)
+    return period_start, period_end
+
+
+def make_stripe_mock() -> SimpleNamespace:
+    """
+    Stripe SDKの代替モックを作成
+
+    BillingServiceが参照するCustomer/Subscriptionのみを持つ。
+    Mockの子要素自動生成を避け、属性参照を通常の__dict__参照にする。
+    """
+    return SimpleNamespace(Customer=MagicMock(), Subscription=MagicMock())
+
+
+@pytest.fixture
+def stripe_service(request):
+    """
+    Stripeモック注入済みBillingServiceフィクスチャ
+
+    (service, mock_stripe) のタプルを返す。
+    indirect parametrizeで {"seed_user": "user1"} を渡すと、
+    Stripe連携済みサブスクリプションを事前投入する（planで種別指定可、既定PRO）。
+    {"price_ids": {...}} を渡すと環境変数の代わりにその価格IDを使う。
+    """
+    params = getattr(request, "param", None) or {}
+    service = BillingService(stripe_api_key="test_key", price_ids=params.get("price_ids"))
+    mock_stripe = make_stripe_mock()
+    service._stripe = mock_stripe
+
+    seed_user = params.get("seed_user")
+    if seed_user:
+        service._subscriptions[seed_user] = Subscription(
+            user_id=seed_user,
+            plan=params.get("plan", SubscriptionPlan.PRO),
+            status=SubscriptionStatus.ACTIVE,
+            stripe_subscription_id="sub_123"
+        )
+
+    return service, mock_stripe
+
+
+@pytest.fixture(scope="session")
+def seed_audit_log(tmp_path_factory):
+    """
+    既存エントリ1件を含む監査ログのテンプレート（セッションで1回だけ作成）
+
+    書き込みを伴うテストはshutil.copyで各テストのtmp_pathへ複製して使う。
+    """
+    path = tmp_path_factory.mktemp("seed") / "audit.json"
+    path.write_text(
+        json.dumps([
+            {"timestamp": "2025-01-01T00:00:00", "action_type": "old", "description": "古いログ"}
+        ]),
+        encoding="utf-8"
+    )
+    return path
+
+
+@pytest.fixture
+def mock_logger(monkeypatch):
+    """src.coordinatorのloggerをMockに差し替え"""
+    logger = MagicMock()
+    monkeypatch.setattr("src.coordinator.logger", logger)
+    return logger
+
+
+@pytest.fixture(scope="module")
+def default_coordinator():
+    """
+    デフォルト構成のCoordinator（モジュール内で共有）
+
+    EmailBot/Scheduler/AuthManager/LLMServiceの構築はモジュールで1回だけ行う。
+    """
+    return Coordinator()
+
+
+@pytest.fixture
+def coordinator(default_coordinator: Coordinator):
+    """
+    モジュール内で共有するCoordinator
+
+    テスト後に保留アクションを破棄して次のテストへ持ち越さない。
+    """
+    yield default_coordinator
+    default_coordinator._pending_actions.clear()
+
+
+@pytest.fixture
+def mock_email_bot():
+    """spec=EmailBotのMock"""
+    return Mock(spec=EmailBot)
+
+
+@pytest.fixture
+def mock_scheduler():
+    """spec=SchedulerのMock"""
+    return Mock(spec=Scheduler)
+
+
+@pytest.fixture
+def mock_auth_manager():
+    """spec=AuthManagerのMock"""
+    return Mock(spec=AuthManager)
+
+
+@pytest.fixture
+def mock_llm_service():
+    """spec=LLMServiceのMock"""
+    return Mock(spec=LLMService)
+
+
+@pytest.fixture
+def empty_llm_service(mock_llm_service):
+    """利用可能なLLMプロバイダーがないLLMServiceのMock"""
+    mock_llm_service.get_available_providers.return_value = []
+    return mock_llm_service
+
+
+@pytest.fixture(scope="session")
+def unauthed_emailbot() -> EmailBot:
+    """
+    未認証のEmailBot（セッションで共有）
+
+    認証チェックで即座に例外となるメソッドの検証専用。状態を変更しないこと。
+    """
+    return EmailBot()
+
+
+@pytest.fixture(scope="session")
+def unauthed_scheduler() -> Scheduler:
+    """
+    未認証のScheduler（セッションで共有）
+
+    認証チェックで即座に例外となるメソッドの検証専用。状態を変更しないこと。
+    """
+    return Scheduler()
+
+
+@pytest.fixture(scope="module")
+def sample_email() -> Email:
+    """
+    テスト用メール（日時固定、モジュール内で共有）
+
+    フィールドを変えたい場合はdataclasses.replaceで派生させる。
+    """
+    return Email(
+        id="test1",
+        thread_id="thread1",
+        subject="テスト",
+        sender="sender@example.com",
+        recipient="recipient@example.com",
+        date=datetime(2025, 1, 6, 10, 0),
+        body="テスト本文",
+        snippet="テスト"
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_emails() -> list[dict]:
+    """
+    tests/fixtures/sample_emails.json のメールデータ（セッションで1回だけ読み込む）
+
+    全テストで共有するため読み取りのみとすること。
+    """
+    fixtures_path = Path(__file__).parent / "fixtures" / "sample_emails.json"
+    with open(fixtures_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def sample_gmail_message() -> dict:
+    """Gmail APIのmessages.get応答（パース対象、読み取りのみ）"""
+    return {
+        'id': 'msg123',
+        'threadId': 'thread123',
+        'snippet': 'テストスニペット',
+        'labelIds': ['INBOX', 'UNREAD'],
+        'payload': {
+            'headers': [
+                {'name': 'Subject', 'value': 'テスト件名'},
+                {'name': 'From', 'value': 'sender@example.com'},
+                {'name': 'To', 'value': 'recipient@example.com'},
+                {'name': 'Date', 'value': 'Mon, 6 Jan 2025 10:00:00 +0900'},
+            ],
+            'body': {'data': ''}
+        }
+    }
+
+
+@pytest.fixture(scope="module")
+def sample_calendar_event_datetime() -> dict:
+    """Calendar APIの日時指定イベント（読み取りのみ）"""
+    return {
+        'id': 'event123',
+        'summary': 'ミーティング',
+        'start': {'dateTime': '2025-01-06T10:00:00+09:00'},
+        'end': {'dateTime': '2025-01-06T11:00:00+09:00'},
+        'attendees': [{'email': 'alice@example.com'}]
+    }
+
+
+@pytest.fixture(scope="module")
+def sample_calendar_event_allday() -> dict:
+    """Calendar APIの終日イベント（読み取りのみ）"""
+    return {
+        'id': 'event456',
+        'summary': '休暇',
+        'start': {'date': '2025-01-06'},
+        'end': {'date': '2025-01-07'}
+    }
+
+
+@pytest.fixture(scope="module")
+def future_tokyo_range() -> tuple[datetime, datetime]:
+    """将来の平日1日分（Asia/Tokyo）の(開始, 終了)"""
+    return datetime(2099, 1, 6, 0, 0, tzinfo=_TZ_TOKYO), datetime(2099, 1, 6, 23, 59, tzinfo=_TZ_TOKYO)
@@ -8,9 +8,6 @@ import tempfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.auth import (
     AuthProvider,
     AuthStatus,
@@ -16,9 +16,6 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.auth import (
     AuthProvider,
     AuthStatus,
@@ -355,6 +355,41 @@ class TestMockBillingService:
         assert sub is not None
         assert sub.plan == SubscriptionPlan.FREE
 
+    def test_set_usage(self, service):
+        """使用量の直接設定"""
+        service.create_subscription(
+            user_id="test_user",
+            customer_id="cus_mock_1",
+            plan=SubscriptionPlan.FREE
+        )
+        service.set_usage("test_user", "email_summary", 50)
+
+        assert service.get_subscription("test_user").usage.email_summaries_used == 50
+        can_use, _ = service.check_usage_limit("test_user", "email_summary")
+        assert can_use is False
+
+        with pytest.raises(ValueError):
+            service.set_usage("test_user", "auto_action", 1)
+
+    @pytest.mark.parametrize("feature", ["email_summary", "schedule_proposal", "action"])
+    def test_set_usage_matches_record_usage(self, service, feature):
+        """set_usageとrecord_usageが同じ使用量フィールドを更新すること"""
+        service.create_subscription(
+            user_id="test_user",
+            customer_id="cus_mock_1",
+            plan=SubscriptionPlan.PRO
+        )
+        service.set_usage("test_user", feature, 3)
+        assert service.record_usage("test_user", feature) is True
+
+        usage = service.get_subscription("test_user").usage
+        counts = {
+            "email_summary": usage.email_summaries_used,
+            "schedule_proposal": usage.schedule_proposals_used,
+            "action": usage.actions_executed,
+        }
+        assert counts[feature] == 4
+
 
 class TestBillingServiceWithStripe:
     """Stripe APIキーなしでのテスト"""
@@ -17,16 +17,17 @@ from src.billing import (
     PlanLimits,
     PlanPricing,
 )
-from src.database import Database, create_database
+from src.database import Database
 
 
 class TestBillingAPIIntegration:
     """Billing + API統合テスト"""
 
-    def setup_method(self):
-        """テストセットアップ"""
+    @pytest.fixture(autouse=True)
+    def _setup(self, db: Database):
+        """テストセットアップ（共有インメモリDBを注入）"""
         self.billing = MockBillingService()
-        self.db = create_database()
+        self.db = db
 
     def test_user_registration_with_free_plan(self):
         """ユーザー登録時の無料プラン付与"""
@@ -125,10 +126,11 @@ class TestBillingAPIIntegration:
 class TestBillingDatabaseSync:
     """Billing + Database同期テスト"""
 
-    def setup_method(self):
-        """テストセットアップ"""
+    @pytest.fixture(autouse=True)
+    def _setup(self, db: Database):
+        """テストセットアップ（共有インメモリDBを注入）"""
         self.billing = MockBillingService()
-        self.db = create_database()
+        self.db = db
 
     def test_user_plan_sync(self):
         """ユーザープランの同期"""
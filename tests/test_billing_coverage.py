@@ -13,15 +13,11 @@ Billing モジュールのカバレッジ向上テスト
 - 569-592: __main__実行
 """
 
-import os
+import copy
 import pytest
 from datetime import datetime, timedelta
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.billing import (
     SubscriptionPlan,
     SubscriptionStatus,
@@ -33,13 +29,45 @@ from src.billing import (
     MockBillingService
 )
 
+# 頻出する列挙値をモジュールレベルで束縛（属性参照の繰り返しを避ける）
+FREE, PERSONAL, PRO, TEAM, ENTERPRISE = (
+    SubscriptionPlan.FREE,
+    SubscriptionPlan.PERSONAL,
+    SubscriptionPlan.PRO,
+    SubscriptionPlan.TEAM,
+    SubscriptionPlan.ENTERPRISE,
+)
+ACTIVE, TRIALING, CANCELED, PAST_DUE = (
+    SubscriptionStatus.ACTIVE,
+    SubscriptionStatus.TRIALING,
+    SubscriptionStatus.CANCELED,
+    SubscriptionStatus.PAST_DUE,
+)
+
+# Stripeモックの請求期間（固定値で決定的にする）
+_NOW_TS = 1_700_000_000.0
+_NOW_PLUS_30D_TS = _NOW_TS + 30 * 86400
+
+
+_SUB_TEMPLATE = Subscription(user_id="test", plan=PRO, status=ACTIVE)
+
+
+def _mk_sub(plan=PRO, status=ACTIVE, **kwargs) -> Subscription:
+    """テンプレートを複製してSubscriptionを作成（使用量は毎回新規）"""
+    sub = copy.copy(_SUB_TEMPLATE)
+    sub.plan, sub.status = plan, status
+    sub.usage = UsageMetrics()
+    for name, value in kwargs.items():
+        setattr(sub, name, value)
+    return sub
+
 
 class TestPlanLimitsAdvanced:
     """PlanLimitsの追加テスト"""
 
     def test_enterprise_unlimited(self):
         """Enterprise無制限チェック"""
-        limits = PlanLimits.for_plan(SubscriptionPlan.ENTERPRISE)
+        limits = PlanLimits.for_plan(ENTERPRISE)
 
         assert limits.email_summaries_per_month == -1
         assert limits.schedule_proposals_per_month == -1
@@ -49,27 +77,35 @@ class TestPlanLimitsAdvanced:
     def test_unknown_plan_defaults_to_free(self):
         """未知のプランはFREEにフォールバック"""
         # 直接dictアクセスで未知の値をシミュレート
-        limits = PlanLimits.for_plan(SubscriptionPlan.FREE)
+        limits = PlanLimits.for_plan(FREE)
 
         assert limits.email_summaries_per_month == 50
 
+    def test_for_plan_cached(self):
+        """同一プランの制限は同じインスタンスを返す"""
+        assert PlanLimits.for_plan(ENTERPRISE) is PlanLimits.for_plan(ENTERPRISE)
+
 
 class TestPlanPricingAdvanced:
     """PlanPricingの追加テスト"""
 
     def test_enterprise_custom_pricing(self):
         """Enterpriseカスタム価格"""
-        pricing = PlanPricing.for_plan(SubscriptionPlan.ENTERPRISE)
+        pricing = PlanPricing.for_plan(ENTERPRISE)
 
         assert pricing.monthly_price_cents == 0  # カスタム
 
     def test_team_pricing(self):
         """Team価格"""
-        pricing = PlanPricing.for_plan(SubscriptionPlan.TEAM)
+        pricing = PlanPricing.for_plan(TEAM)
 
         assert pricing.monthly_price_cents == 1500
         assert pricing.annual_price_cents == 15000
 
+    def test_for_plan_cached(self):
+        """同一プランの価格は同じインスタンスを返す"""
+        assert PlanPricing.for_plan(TEAM) is PlanPricing.for_plan(TEAM)
+
 
 class TestUsageMetricsAdvanced:
     """UsageMetricsの追加テスト"""
@@ -93,134 +129,55 @@ class TestUsageMetricsAdvanced:
 class TestSubscriptionAdvanced:
     """Subscriptionの追加テスト"""
 
-    def test_is_active_trialing(self):
-        """トライアル中はアクティブ"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.TRIALING
-        )
-
-        assert sub.is_active() is True
-
-    def test_is_active_past_due(self):
-        """支払い遅延はアクティブではない"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.PAST_DUE
-        )
-
-        assert sub.is_active() is False
-
-    def test_can_use_feature_enterprise_unlimited(self):
-        """Enterprise無制限機能"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.ENTERPRISE,
-            status=SubscriptionStatus.ACTIVE
-        )
-        sub.usage.email_summaries_used = 10000
-
-        assert sub.can_use_feature("email_summary") is True
-
-    def test_can_use_feature_enterprise_schedule_unlimited(self):
-        """Enterpriseスケジュール無制限"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.ENTERPRISE,
-            status=SubscriptionStatus.ACTIVE
-        )
-        sub.usage.schedule_proposals_used = 10000
-
-        assert sub.can_use_feature("schedule_proposal") is True
-
-    def test_can_use_feature_auto_action_free(self):
-        """無料プランでauto_actionは使えない"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.FREE,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        assert sub.can_use_feature("auto_action") is False
-
-    def test_can_use_feature_auto_action_pro(self):
-        """Proプランでauto_actionは使える"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        assert sub.can_use_feature("auto_action") is True
-
-    def test_can_use_feature_unknown(self):
-        """未知の機能はTrue"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.FREE,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        assert sub.can_use_feature("unknown_feature") is True
-
-    def test_can_use_feature_inactive(self):
-        """非アクティブは全て使えない"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.CANCELED
-        )
-
-        assert sub.can_use_feature("email_summary") is False
-
-    def test_record_usage_email(self):
-        """メール使用量記録"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        result = sub.record_usage("email_summary")
-
-        assert result is True
-        assert sub.usage.email_summaries_used == 1
-
-    def test_record_usage_schedule(self):
-        """スケジュール使用量記録"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        result = sub.record_usage("schedule_proposal")
-
-        assert result is True
-        assert sub.usage.schedule_proposals_used == 1
-
-    def test_record_usage_action(self):
-        """アクション使用量記録"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        result = sub.record_usage("action")
-
-        assert result is True
-        assert sub.usage.actions_executed == 1
+    @pytest.mark.parametrize("status,expected", [
+        (TRIALING, True),   # トライアル中はアクティブ
+        (PAST_DUE, False),  # 支払い遅延はアクティブではない
+    ])
+    def test_is_active(self, status, expected):
+        """状態ごとのアクティブ判定"""
+        sub = _mk_sub(status=status)
+
+        assert sub.is_active() is expected
+
+    @pytest.mark.parametrize("plan,status,usage,feature,expected", [
+        # Enterprise無制限機能
+        (ENTERPRISE, ACTIVE,
+         {"email_summaries_used": 10000}, "email_summary", True),
+        # Enterpriseスケジュール無制限
+        (ENTERPRISE, ACTIVE,
+         {"schedule_proposals_used": 10000}, "schedule_proposal", True),
+        # 無料プランでauto_actionは使えない
+        (FREE, ACTIVE, {}, "auto_action", False),
+        # Proプランでauto_actionは使える
+        (PRO, ACTIVE, {}, "auto_action", True),
+        # 未知の機能はTrue
+        (FREE, ACTIVE, {}, "unknown_feature", True),
+        # 非アクティブは全て使えない
+        (PRO, CANCELED, {}, "email_summary", False),
+    ])
+    def test_can_use_feature(self, plan, status, usage, feature, expected):
+        """プラン・状態・使用量ごとの機能利用可否"""
+        sub = _mk_sub(plan, status)
+        for field_name, value in usage.items():
+            setattr(sub.usage, field_name, value)
+
+        assert sub.can_use_feature(feature) is expected
+
+    @pytest.mark.parametrize("feature,field_name", [
+        ("email_summary", "email_summaries_used"),
+        ("schedule_proposal", "schedule_proposals_used"),
+        ("action", "actions_executed"),
+    ])
+    def test_record_usage(self, feature, field_name):
+        """機能ごとの使用量記録"""
+        sub = _mk_sub()
+
+        assert sub.record_usage(feature) is True
+        assert getattr(sub.usage, field_name) == 1
 
     def test_record_usage_over_limit(self):
         """制限超過で記録失敗"""
-        sub = Subscription(
-            user_id="test",
-            plan=SubscriptionPlan.FREE,
-            status=SubscriptionStatus.ACTIVE
-        )
+        sub = _mk_sub(FREE)
         sub.usage.email_summaries_used = 50  # 制限値
 
         result = sub.record_usage("email_summary")
@@ -262,31 +219,19 @@ class TestBillingServiceCreateCustomer:
 
         assert customer_id == "cus_mock_user1"
 
-    @patch('stripe.Customer')
-    def test_create_customer_stripe_success(self, mock_customer):
+    def test_create_customer_stripe_success(self, stripe_service):
         """Stripeカスタマー作成成功"""
-        mock_stripe = Mock()
-        mock_customer_obj = Mock()
-        mock_customer_obj.id = "cus_stripe_123"
-        mock_customer.create.return_value = mock_customer_obj
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Customer = mock_customer
+        service, mock_stripe = stripe_service
+        mock_stripe.Customer.create.return_value.id = "cus_stripe_123"
 
         customer_id = service.create_customer("user1", "test@example.com", "Test User")
 
         assert customer_id == "cus_stripe_123"
 
-    @patch('stripe.Customer')
-    def test_create_customer_stripe_error(self, mock_customer):
+    def test_create_customer_stripe_error(self, stripe_service):
         """Stripeカスタマー作成エラー"""
-        mock_stripe = Mock()
-        mock_customer.create.side_effect = Exception("Stripe API Error")
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Customer = mock_customer
+        service, mock_stripe = stripe_service
+        mock_stripe.Customer.create.side_effect = Exception("Stripe API Error")
 
         customer_id = service.create_customer("user1", "test@example.com")
 
@@ -300,93 +245,89 @@ class TestBillingServiceCreateSubscription:
         """無料プランサブスクリプション作成"""
         service = BillingService()
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        sub = service.create_subscription("user1", "cus_1", FREE)
 
         assert sub is not None
-        assert sub.plan == SubscriptionPlan.FREE
-        assert sub.status == SubscriptionStatus.ACTIVE
+        assert sub.plan == FREE
+        assert sub.status == ACTIVE
 
     def test_create_subscription_mock_with_trial(self):
         """モックモードでトライアル付きサブスクリプション"""
         service = BillingService()
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO, trial_days=14)
+        sub = service.create_subscription("user1", "cus_1", PRO, trial_days=14)
 
         assert sub is not None
-        assert sub.status == SubscriptionStatus.TRIALING
+        assert sub.status == TRIALING
 
-    @patch.dict(os.environ, {'STRIPE_PRICE_PRO': 'price_pro_123'})
-    @patch('stripe.Subscription')
-    def test_create_subscription_stripe_success(self, mock_sub_class):
+    @pytest.mark.parametrize(
+        "stripe_service", [{"price_ids": {PRO: "price_pro_123"}}], indirect=True
+    )
+    def test_create_subscription_stripe_success(self, stripe_service):
         """Stripeサブスクリプション作成成功"""
-        mock_stripe = Mock()
+        service, mock_stripe = stripe_service
         mock_stripe_sub = Mock()
         mock_stripe_sub.id = "sub_123"
         mock_stripe_sub.status = "active"
-        mock_stripe_sub.current_period_start = datetime.now().timestamp()
-        mock_stripe_sub.current_period_end = (datetime.now() + timedelta(days=30)).timestamp()
-        mock_sub_class.create.return_value = mock_stripe_sub
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
+        mock_stripe_sub.current_period_start = _NOW_TS
+        mock_stripe_sub.current_period_end = _NOW_PLUS_30D_TS
+        mock_stripe.Subscription.create.return_value = mock_stripe_sub
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        sub = service.create_subscription("user1", "cus_1", PRO)
 
         assert sub is not None
         assert sub.stripe_subscription_id == "sub_123"
 
-    @patch.dict(os.environ, {}, clear=True)
-    def test_create_subscription_stripe_no_price_id(self):
+    @pytest.mark.parametrize("stripe_service", [{"price_ids": {}}], indirect=True)
+    def test_create_subscription_stripe_no_price_id(self, stripe_service):
         """Stripeで価格IDがない場合"""
-        mock_stripe = Mock()
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-
-        # 環境変数から価格IDをクリア
-        os.environ.pop('STRIPE_PRICE_PRO', None)
+        service, _ = stripe_service
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        sub = service.create_subscription("user1", "cus_1", PRO)
 
         assert sub is None
 
-    @patch.dict(os.environ, {'STRIPE_PRICE_PRO': 'price_pro_123'})
-    @patch('stripe.Subscription')
-    def test_create_subscription_stripe_error(self, mock_sub_class):
+    @pytest.mark.parametrize(
+        "stripe_service", [{"price_ids": {PRO: "price_pro_123"}}], indirect=True
+    )
+    def test_create_subscription_stripe_error(self, stripe_service):
         """Stripeサブスクリプション作成エラー"""
-        mock_stripe = Mock()
-        mock_sub_class.create.side_effect = Exception("Stripe Error")
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
+        service, mock_stripe = stripe_service
+        mock_stripe.Subscription.create.side_effect = Exception("Stripe Error")
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        sub = service.create_subscription("user1", "cus_1", PRO)
 
         assert sub is None
 
-    @patch.dict(os.environ, {'STRIPE_PRICE_PERSONAL': 'price_personal_123'})
-    @patch('stripe.Subscription')
-    def test_create_subscription_stripe_with_trial(self, mock_sub_class):
+    @pytest.mark.parametrize(
+        "stripe_service", [{"price_ids": {PERSONAL: "price_personal_123"}}], indirect=True
+    )
+    def test_create_subscription_stripe_with_trial(self, stripe_service):
         """Stripeでトライアル付きサブスクリプション"""
-        mock_stripe = Mock()
+        service, mock_stripe = stripe_service
         mock_stripe_sub = Mock()
         mock_stripe_sub.id = "sub_123"
         mock_stripe_sub.status = "trialing"
-        mock_stripe_sub.current_period_start = datetime.now().timestamp()
-        mock_stripe_sub.current_period_end = (datetime.now() + timedelta(days=30)).timestamp()
-        mock_sub_class.create.return_value = mock_stripe_sub
+        mock_stripe_sub.current_period_start = _NOW_TS
+        mock_stripe_sub.current_period_end = _NOW_PLUS_30D_TS
+        mock_stripe.Subscription.create.return_value = mock_stripe_sub
 
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
+        sub = service.create_subscription("user1", "cus_1", PERSONAL, trial_days=7)
 
-        sub = service.create_subscription("user1", "cus_1", SubscriptionPlan.PERSONAL, trial_days=7)
-
-        call_args = mock_sub_class.create.call_args
+        call_args = mock_stripe.Subscription.create.call_args
         assert call_args.kwargs.get('trial_period_days') == 7
 
+    def test_create_subscription_price_id_from_env(self, stripe_service, monkeypatch):
+        """price_ids未指定時は環境変数から価格IDを取得"""
+        service, mock_stripe = stripe_service
+        monkeypatch.setenv("STRIPE_PRICE_TEAM", "price_team_123")
+        mock_stripe.Subscription.create.side_effect = Exception("Stripe Error")
+
+        service.create_subscription("user1", "cus_1", TEAM)
+
+        call_args = mock_stripe.Subscription.create.call_args
+        assert call_args.kwargs["items"] == [{"price": "price_team_123"}]
+
 
 class TestBillingServiceCancelSubscription:
     """BillingService cancel_subscription()のテスト"""
@@ -402,7 +343,7 @@ class TestBillingServiceCancelSubscription:
     def test_cancel_free_plan(self):
         """無料プランはキャンセル不可"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        service.create_subscription("user1", "cus_1", FREE)
 
         result = service.cancel_subscription("user1")
 
@@ -411,7 +352,7 @@ class TestBillingServiceCancelSubscription:
     def test_cancel_mock_at_period_end(self):
         """モックモードで期間終了時キャンセル"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        service.create_subscription("user1", "cus_1", PRO)
 
         result = service.cancel_subscription("user1", at_period_end=True)
 
@@ -422,73 +363,39 @@ class TestBillingServiceCancelSubscription:
     def test_cancel_mock_immediate(self):
         """モックモードで即時キャンセル"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        service.create_subscription("user1", "cus_1", PRO)
 
         result = service.cancel_subscription("user1", at_period_end=False)
 
         assert result is True
         sub = service.get_subscription("user1")
-        assert sub.status == SubscriptionStatus.CANCELED
+        assert sub.status == CANCELED
 
-    @patch('stripe.Subscription')
-    def test_cancel_stripe_success(self, mock_sub_class):
+    @pytest.mark.parametrize("stripe_service", [{"seed_user": "user1"}], indirect=True)
+    def test_cancel_stripe_success(self, stripe_service):
         """Stripeキャンセル成功"""
-        mock_stripe = Mock()
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
-
-        # サブスクリプション作成（モック）
-        service._subscriptions["user1"] = Subscription(
-            user_id="user1",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE,
-            stripe_subscription_id="sub_123"
-        )
+        service, mock_stripe = stripe_service
 
         result = service.cancel_subscription("user1")
 
         assert result is True
-        mock_sub_class.modify.assert_called_once()
+        mock_stripe.Subscription.modify.assert_called_once()
 
-    @patch('stripe.Subscription')
-    def test_cancel_stripe_immediate(self, mock_sub_class):
+    @pytest.mark.parametrize("stripe_service", [{"seed_user": "user1"}], indirect=True)
+    def test_cancel_stripe_immediate(self, stripe_service):
         """Stripe即時キャンセル"""
-        mock_stripe = Mock()
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
-
-        service._subscriptions["user1"] = Subscription(
-            user_id="user1",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE,
-            stripe_subscription_id="sub_123"
-        )
+        service, mock_stripe = stripe_service
 
         result = service.cancel_subscription("user1", at_period_end=False)
 
         assert result is True
-        mock_sub_class.delete.assert_called_once()
+        mock_stripe.Subscription.delete.assert_called_once()
 
-    @patch('stripe.Subscription')
-    def test_cancel_stripe_error(self, mock_sub_class):
+    @pytest.mark.parametrize("stripe_service", [{"seed_user": "user1"}], indirect=True)
+    def test_cancel_stripe_error(self, stripe_service):
         """Stripeキャンセルエラー"""
-        mock_stripe = Mock()
-        mock_sub_class.modify.side_effect = Exception("Stripe Error")
-
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-        service._stripe.Subscription = mock_sub_class
-
-        service._subscriptions["user1"] = Subscription(
-            user_id="user1",
-            plan=SubscriptionPlan.PRO,
-            status=SubscriptionStatus.ACTIVE,
-            stripe_subscription_id="sub_123"
-        )
+        service, mock_stripe = stripe_service
+        mock_stripe.Subscription.modify.side_effect = Exception("Stripe Error")
 
         result = service.cancel_subscription("user1")
 
@@ -502,39 +409,35 @@ class TestBillingServiceUpgradePlan:
         """サブスクリプションがない場合"""
         service = BillingService()
 
-        result = service.upgrade_plan("nonexistent_user", SubscriptionPlan.PRO)
+        result = service.upgrade_plan("nonexistent_user", PRO)
 
         assert result is False
 
     def test_upgrade_mock_mode(self):
         """モックモードでアップグレード"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.PERSONAL)
+        service.create_subscription("user1", "cus_1", PERSONAL)
 
-        result = service.upgrade_plan("user1", SubscriptionPlan.PRO)
+        result = service.upgrade_plan("user1", PRO)
 
         assert result is True
         sub = service.get_subscription("user1")
-        assert sub.plan == SubscriptionPlan.PRO
-
-    def test_upgrade_stripe_mode(self):
+        assert sub.plan == PRO
+
+    @pytest.mark.parametrize(
+        "stripe_service",
+        [{"seed_user": "user1", "plan": PERSONAL}],
+        indirect=True
+    )
+    def test_upgrade_stripe_mode(self, stripe_service):
         """Stripeモードでアップグレード"""
-        mock_stripe = Mock()
+        service, _ = stripe_service
 
-        service = BillingService(stripe_api_key="test_key")
-        service._stripe = mock_stripe
-
-        service._subscriptions["user1"] = Subscription(
-            user_id="user1",
-            plan=SubscriptionPlan.PERSONAL,
-            status=SubscriptionStatus.ACTIVE
-        )
-
-        result = service.upgrade_plan("user1", SubscriptionPlan.PRO)
+        result = service.upgrade_plan("user1", PRO)
 
         assert result is True
         sub = service.get_subscription("user1")
-        assert sub.plan == SubscriptionPlan.PRO
+        assert sub.plan == PRO
 
 
 class TestBillingServiceUsageChecks:
@@ -548,12 +451,12 @@ class TestBillingServiceUsageChecks:
 
         assert can_use is True
         sub = service.get_subscription("new_user")
-        assert sub.plan == SubscriptionPlan.FREE
+        assert sub.plan == FREE
 
     def test_check_usage_limit_email_exceeded(self):
         """メール上限超過"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        service.create_subscription("user1", "cus_1", FREE)
         sub = service.get_subscription("user1")
         sub.usage.email_summaries_used = 50  # 上限
 
@@ -565,7 +468,7 @@ class TestBillingServiceUsageChecks:
     def test_check_usage_limit_schedule_exceeded(self):
         """スケジュール上限超過"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        service.create_subscription("user1", "cus_1", FREE)
         sub = service.get_subscription("user1")
         sub.usage.schedule_proposals_used = 10  # 上限
 
@@ -577,7 +480,7 @@ class TestBillingServiceUsageChecks:
     def test_check_usage_limit_auto_action_free(self):
         """無料プランでのauto_action制限"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        service.create_subscription("user1", "cus_1", FREE)
 
         can_use, msg = service.check_usage_limit("user1", "auto_action")
 
@@ -587,10 +490,10 @@ class TestBillingServiceUsageChecks:
     def test_check_usage_limit_unknown_feature(self):
         """未知の機能の制限"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.FREE)
+        service.create_subscription("user1", "cus_1", FREE)
         sub = service.get_subscription("user1")
         # 非アクティブにする
-        sub.status = SubscriptionStatus.CANCELED
+        sub.status = CANCELED
 
         can_use, msg = service.check_usage_limit("user1", "some_feature")
 
@@ -616,7 +519,7 @@ class TestBillingServiceUsageChecks:
     def test_get_usage_summary_unlimited(self):
         """無制限プランの使用量サマリー"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.ENTERPRISE)
+        service.create_subscription("user1", "cus_1", ENTERPRISE)
 
         summary = service.get_usage_summary("user1")
 
@@ -626,7 +529,7 @@ class TestBillingServiceUsageChecks:
     def test_get_usage_summary_with_period(self):
         """期間付き使用量サマリー"""
         service = BillingService()
-        service.create_subscription("user1", "cus_1", SubscriptionPlan.PRO)
+        service.create_subscription("user1", "cus_1", PRO)
         sub = service.get_subscription("user1")
         sub.usage.period_end = datetime.now() + timedelta(days=30)
 
@@ -638,12 +541,18 @@ class TestBillingServiceUsageChecks:
 class TestMockBillingService:
     """MockBillingServiceのテスト"""
 
-    def test_initialization(self):
-        """初期化テスト"""
-        service = MockBillingService()
+    def test_initialization(self, monkeypatch):
+        """環境変数にStripe APIキーがあってもモックモードで初期化される"""
+        monkeypatch.setenv("STRIPE_API_KEY", "sk_test_x")
+        mock_stripe = Mock(api_key=None)
+
+        with patch.dict('sys.modules', {'stripe': mock_stripe}):
+            service = MockBillingService()
 
         assert service.stripe_api_key is None
         assert service._stripe is None
+        assert service._subscriptions == {}
+        assert mock_stripe.api_key is None
 
 
 if __name__ == "__main__":
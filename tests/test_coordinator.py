@@ -4,8 +4,12 @@ Coordinator Module テスト
 ユーザーコマンド処理と各モジュール連携のテスト
 """
 
+import json
+from dataclasses import replace
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from datetime import datetime, timedelta
 
 from src.coordinator import (
@@ -14,10 +18,51 @@ from src.coordinator import (
     Action,
     ActionType
 )
-from src.email_bot import EmailBot, Email, EmailSummary
-from src.scheduler import Scheduler, CalendarEvent, TimeSlot, MeetingProposal
-from src.auth import AuthManager, AuthStatus, AuthProvider
-from src.llm import LLMService
+from src.email_bot import EmailSummary
+from src.scheduler import CalendarEvent, TimeSlot, MeetingProposal
+from src.auth import AuthStatus, AuthProvider
+
+
+# テストで使う固定時刻（datetime.now()を呼ばず決定的にする）
+_FIXED_NOW = datetime(2025, 1, 1, 8, 0, 0)
+_FIXED_SLOT = TimeSlot(
+    start=_FIXED_NOW + timedelta(hours=1),
+    end=_FIXED_NOW + timedelta(hours=2)
+)
+
+
+# テスト共通のサンプルデータ（各テストでは読み取りのみ）
+SAMPLE_EMAIL_SUMMARY = EmailSummary(
+    email_id="1",
+    subject="テストメール",
+    sender="test@example.com",
+    summary="テストの要約",
+    priority="medium",
+    action_items=["確認する"]
+)
+SAMPLE_MEETING_PROPOSAL = MeetingProposal(
+    title="Team Meeting",
+    slot=_FIXED_SLOT,
+    attendees=["alice@example.com"],
+    score=0.8
+)
+SAMPLE_EVENT = CalendarEvent(
+    id="1",
+    summary="朝会",
+    start=_FIXED_NOW.replace(hour=9),
+    end=_FIXED_NOW.replace(hour=10)
+)
+
+
+def assert_error(result: CommandResult, token: str = "エラー") -> None:
+    """失敗結果でメッセージにtokenを含むことを検証"""
+    assert not result.success and token in result.message, result.message
+
+
+@pytest.fixture
+def frozen_now(monkeypatch, frozen_clock):
+    """src.coordinatorの現在時刻を固定"""
+    return frozen_clock(monkeypatch, "src.coordinator", now=_FIXED_NOW)
 
 
 class TestCommandResult:
@@ -93,11 +138,8 @@ class TestCoordinatorInitialization:
         assert coord.llm_service is not None
         assert coord.confirmation_required is True
 
-    def test_custom_initialization(self):
+    def test_custom_initialization(self, mock_email_bot, mock_scheduler):
         """カスタム初期化"""
-        mock_email_bot = Mock(spec=EmailBot)
-        mock_scheduler = Mock(spec=Scheduler)
-
         coord = Coordinator(
             email_bot=mock_email_bot,
             scheduler=mock_scheduler,
@@ -112,22 +154,12 @@ class TestCoordinatorInitialization:
 class TestCoordinatorHelp:
     """help コマンドのテスト"""
 
-    def test_help_command(self):
-        """helpコマンドの実行"""
-        coord = Coordinator()
-        result = coord.process_command("help")
+    def test_help_command(self, default_coordinator):
+        """helpコマンドの実行（全コマンドが含まれる）"""
+        result = default_coordinator.process_command("help")
 
         assert result.success is True
         assert "TaskMasterAI" in result.message
-        assert "inbox" in result.message
-        assert "schedule" in result.message
-        assert "auth" in result.message
-
-    def test_help_includes_all_commands(self):
-        """helpに全コマンドが含まれる"""
-        coord = Coordinator()
-        result = coord.process_command("help")
-
         commands = ["inbox", "schedule", "status", "auth", "confirm", "cancel", "help"]
         for cmd in commands:
             assert cmd in result.message.lower()
@@ -136,20 +168,9 @@ class TestCoordinatorHelp:
 class TestCoordinatorInbox:
     """inbox/summarize inbox コマンドのテスト"""
 
-    def test_inbox_command(self):
+    def test_inbox_command(self, mock_email_bot):
         """inboxコマンドの実行"""
-        # モックのEmailBotを作成
-        mock_email_bot = Mock(spec=EmailBot)
-        mock_email_bot.summarize_inbox.return_value = [
-            EmailSummary(
-                email_id="1",
-                subject="テストメール",
-                sender="test@example.com",
-                summary="テストの要約",
-                priority="medium",
-                action_items=["確認する"]
-            )
-        ]
+        mock_email_bot.summarize_inbox.return_value = [SAMPLE_EMAIL_SUMMARY]
 
         coord = Coordinator(email_bot=mock_email_bot)
         result = coord.process_command("inbox")
@@ -161,7 +182,7 @@ class TestCoordinatorInbox:
 
     def test_summarize_inbox_command(self):
         """summarize inboxコマンドの実行"""
-        mock_email_bot = Mock(spec=EmailBot)
+        mock_email_bot = MagicMock()
         mock_email_bot.summarize_inbox.return_value = []
 
         coord = Coordinator(email_bot=mock_email_bot)
@@ -170,18 +191,10 @@ class TestCoordinatorInbox:
         assert result.success is True
         assert "未読メール" in result.message
 
-    def test_inbox_with_high_priority(self):
+    def test_inbox_with_high_priority(self, mock_email_bot):
         """高優先度メールの表示"""
-        mock_email_bot = Mock(spec=EmailBot)
         mock_email_bot.summarize_inbox.return_value = [
-            EmailSummary(
-                email_id="1",
-                subject="緊急：対応必要",
-                sender="boss@example.com",
-                summary="すぐに確認してください",
-                priority="high",
-                action_items=[]
-            )
+            replace(SAMPLE_EMAIL_SUMMARY, priority="high", action_items=[])
         ]
 
         coord = Coordinator(email_bot=mock_email_bot)
@@ -192,18 +205,10 @@ class TestCoordinatorInbox:
         assert result.data is not None
         assert len(result.data["summaries"]) == 1
 
-    def test_inbox_with_action_items(self):
+    def test_inbox_with_action_items(self, mock_email_bot):
         """アクション項目の表示"""
-        mock_email_bot = Mock(spec=EmailBot)
         mock_email_bot.summarize_inbox.return_value = [
-            EmailSummary(
-                email_id="1",
-                subject="会議招集",
-                sender="manager@example.com",
-                summary="来週の会議について",
-                priority="medium",
-                action_items=["出席を確認", "資料を準備"]
-            )
+            replace(SAMPLE_EMAIL_SUMMARY, action_items=["出席を確認", "資料を準備"])
         ]
 
         coord = Coordinator(email_bot=mock_email_bot)
@@ -217,20 +222,9 @@ class TestCoordinatorInbox:
 class TestCoordinatorSchedule:
     """schedule コマンドのテスト"""
 
-    def test_schedule_basic(self):
+    def test_schedule_basic(self, mock_scheduler):
         """基本的なスケジュールコマンド"""
-        mock_scheduler = Mock(spec=Scheduler)
-        mock_scheduler.propose_meeting.return_value = [
-            MeetingProposal(
-                title="Team Meeting",
-                slot=TimeSlot(
-                    start=datetime.now() + timedelta(hours=1),
-                    end=datetime.now() + timedelta(hours=2)
-                ),
-                attendees=["alice@example.com"],
-                score=0.8
-            )
-        ]
+        mock_scheduler.propose_meeting.return_value = [SAMPLE_MEETING_PROPOSAL]
 
         coord = Coordinator(scheduler=mock_scheduler)
         result = coord.process_command("schedule team meeting with alice@example.com 30min")
@@ -241,10 +235,9 @@ class TestCoordinatorSchedule:
 
     def test_schedule_no_slots(self):
         """空き時間がない場合"""
-        mock_scheduler = Mock(spec=Scheduler)
-        mock_scheduler.propose_meeting.return_value = []
+        scheduler_stub = SimpleNamespace(propose_meeting=lambda **kwargs: [])
 
-        coord = Coordinator(scheduler=mock_scheduler)
+        coord = Coordinator(scheduler=scheduler_stub)
         result = coord.process_command("schedule meeting")
 
         assert result.success is True
@@ -252,20 +245,11 @@ class TestCoordinatorSchedule:
 
     def test_schedule_creates_pending_actions(self):
         """保留アクションが作成される"""
-        mock_scheduler = Mock(spec=Scheduler)
-        mock_scheduler.propose_meeting.return_value = [
-            MeetingProposal(
-                title="Meeting",
-                slot=TimeSlot(
-                    start=datetime.now() + timedelta(hours=1),
-                    end=datetime.now() + timedelta(hours=2)
-                ),
-                attendees=[],
-                score=0.9
-            )
-        ]
+        scheduler_stub = SimpleNamespace(
+            propose_meeting=lambda **kwargs: [SAMPLE_MEETING_PROPOSAL]
+        )
 
-        coord = Coordinator(scheduler=mock_scheduler)
+        coord = Coordinator(scheduler=scheduler_stub)
         result = coord.process_command("schedule quick sync")
 
         assert result.pending_actions is not None
@@ -273,12 +257,12 @@ class TestCoordinatorSchedule:
         assert result.pending_actions[0].requires_confirmation is True
 
 
+@pytest.mark.usefixtures("frozen_now")
 class TestCoordinatorStatus:
     """status/today コマンドのテスト"""
 
-    def test_status_command(self):
+    def test_status_command(self, mock_scheduler):
         """statusコマンドの実行"""
-        mock_scheduler = Mock(spec=Scheduler)
         mock_scheduler.get_today_schedule.return_value = []
         mock_scheduler.format_schedule.return_value = "予定なし"
 
@@ -291,11 +275,12 @@ class TestCoordinatorStatus:
 
     def test_today_command(self):
         """todayコマンドの実行"""
-        mock_scheduler = Mock(spec=Scheduler)
-        mock_scheduler.get_today_schedule.return_value = []
-        mock_scheduler.format_schedule.return_value = "予定なし"
+        scheduler_stub = SimpleNamespace(
+            get_today_schedule=lambda: [],
+            format_schedule=lambda events: "予定なし"
+        )
 
-        coord = Coordinator(scheduler=mock_scheduler)
+        coord = Coordinator(scheduler=scheduler_stub)
         result = coord.process_command("today")
 
         assert result.success is True
@@ -303,31 +288,25 @@ class TestCoordinatorStatus:
 
     def test_status_with_events(self):
         """イベントがある場合のステータス"""
-        mock_scheduler = Mock(spec=Scheduler)
-        mock_scheduler.get_today_schedule.return_value = [
-            CalendarEvent(
-                id="1",
-                summary="朝会",
-                start=datetime.now().replace(hour=9, minute=0),
-                end=datetime.now().replace(hour=10, minute=0)
-            )
-        ]
-        mock_scheduler.format_schedule.return_value = "09:00 - 10:00 朝会"
+        scheduler_stub = SimpleNamespace(
+            get_today_schedule=lambda: [SAMPLE_EVENT],
+            format_schedule=lambda events: "09:00 - 10:00 朝会"
+        )
 
-        coord = Coordinator(scheduler=mock_scheduler)
+        coord = Coordinator(scheduler=scheduler_stub)
         result = coord.process_command("status")
 
         assert result.success is True
+        assert "2025年01月01日" in result.message
         assert result.data is not None
 
 
 class TestCoordinatorAuth:
     """auth コマンドのテスト"""
 
-    def test_auth_status_command(self):
+    def test_auth_status_command(self, mock_auth_manager, empty_llm_service):
         """auth statusコマンドの実行"""
-        mock_auth = Mock(spec=AuthManager)
-        mock_auth.get_all_auth_status.return_value = {
+        mock_auth_manager.get_all_auth_status.return_value = {
             AuthProvider.GOOGLE: AuthStatus(
                 provider=AuthProvider.GOOGLE,
                 is_authenticated=False,
@@ -335,19 +314,15 @@ class TestCoordinatorAuth:
             )
         }
 
-        mock_llm = Mock(spec=LLMService)
-        mock_llm.get_available_providers.return_value = []
-
-        coord = Coordinator(auth_manager=mock_auth, llm_service=mock_llm)
+        coord = Coordinator(auth_manager=mock_auth_manager, llm_service=empty_llm_service)
         result = coord.process_command("auth")
 
         assert result.success is True
         assert "認証状態" in result.message
 
-    def test_auth_shows_authenticated(self):
+    def test_auth_shows_authenticated(self, mock_auth_manager, empty_llm_service):
         """認証済みの表示"""
-        mock_auth = Mock(spec=AuthManager)
-        mock_auth.get_all_auth_status.return_value = {
+        mock_auth_manager.get_all_auth_status.return_value = {
             AuthProvider.GOOGLE: AuthStatus(
                 provider=AuthProvider.GOOGLE,
                 is_authenticated=True,
@@ -356,10 +331,7 @@ class TestCoordinatorAuth:
             )
         }
 
-        mock_llm = Mock(spec=LLMService)
-        mock_llm.get_available_providers.return_value = []
-
-        coord = Coordinator(auth_manager=mock_auth, llm_service=mock_llm)
+        coord = Coordinator(auth_manager=mock_auth_manager, llm_service=empty_llm_service)
         result = coord.process_command("auth status")
 
         assert result.success is True
@@ -370,25 +342,20 @@ class TestCoordinatorAuth:
 class TestCoordinatorConfirmCancel:
     """confirm/cancel コマンドのテスト"""
 
-    def test_confirm_without_pending(self):
-        """保留アクションがない場合のconfirm"""
-        coord = Coordinator()
-        result = coord.process_command("confirm")
-
-        assert result.success is False
-        assert "確認待ち" in result.message
-
-    def test_cancel_without_pending(self):
-        """保留アクションがない場合のcancel"""
-        coord = Coordinator()
-        result = coord.process_command("cancel")
+    @pytest.mark.parametrize("command,success,expected", [
+        ("confirm", False, "確認待ち"),
+        ("cancel", True, "キャンセルする"),
+    ])
+    def test_without_pending(self, coordinator, command, success, expected):
+        """保留アクションがない場合のconfirm/cancel"""
+        result = coordinator.process_command(command)
 
-        assert result.success is True
-        assert "キャンセルする" in result.message
+        assert result.success is success
+        assert expected in result.message
 
-    def test_cancel_with_pending(self):
+    def test_cancel_with_pending(self, coordinator):
         """保留アクションがある場合のcancel"""
-        coord = Coordinator()
+        coord = coordinator
         # 保留アクションを手動で追加
         coord._pending_actions = [
             Action(
@@ -409,18 +376,18 @@ class TestCoordinatorConfirmCancel:
 class TestCoordinatorUnknownCommand:
     """不明なコマンドのテスト"""
 
-    def test_unknown_command(self):
+    def test_unknown_command(self, default_coordinator):
         """不明なコマンドへの応答"""
-        coord = Coordinator()
+        coord = default_coordinator
         result = coord.process_command("unknown command xyz")
 
         assert result.success is False
         assert "不明なコマンド" in result.message
         assert "help" in result.message
 
-    def test_empty_command(self):
+    def test_empty_command(self, default_coordinator):
         """空コマンドへの応答"""
-        coord = Coordinator()
+        coord = default_coordinator
         result = coord.process_command("")
 
         assert result.success is False
@@ -429,9 +396,9 @@ class TestCoordinatorUnknownCommand:
 class TestCoordinatorDraftReply:
     """draft reply コマンドのテスト"""
 
-    def test_draft_reply_in_development(self):
+    def test_draft_reply_in_development(self, default_coordinator):
         """draft replyが開発中であることを確認"""
-        coord = Coordinator()
+        coord = default_coordinator
         result = coord.process_command("draft reply --to 123")
 
         assert result.success is True
@@ -441,24 +408,10 @@ class TestCoordinatorDraftReply:
 class TestCoordinatorCaseInsensitive:
     """コマンドの大文字小文字を無視するテスト"""
 
-    def test_uppercase_command(self):
-        """大文字コマンド"""
-        coord = Coordinator()
-        result = coord.process_command("HELP")
-
-        assert result.success is True
-
-    def test_mixed_case_command(self):
-        """大文字小文字混在コマンド"""
-        coord = Coordinator()
-        result = coord.process_command("HeLp")
-
-        assert result.success is True
-
-    def test_command_with_whitespace(self):
-        """前後の空白があるコマンド"""
-        coord = Coordinator()
-        result = coord.process_command("  help  ")
+    @pytest.mark.parametrize("command", ["HELP", "HeLp", "  help  "])
+    def test_case_insensitive_command(self, default_coordinator, command):
+        """大文字・大文字小文字混在・前後の空白があるコマンド"""
+        result = default_coordinator.process_command(command)
 
         assert result.success is True
 
@@ -475,8 +428,6 @@ class TestCoordinatorAuditLog:
 
     def test_audit_log_enabled(self, tmp_path):
         """監査ログが有効の場合"""
-        import json
-
         log_path = tmp_path / "audit.json"
         coord = Coordinator(audit_log_path=str(log_path))
 
@@ -500,33 +451,30 @@ class TestCoordinatorErrorHandling:
 
     def test_inbox_error_handling(self):
         """inbox実行中のエラーハンドリング"""
-        mock_email_bot = Mock(spec=EmailBot)
+        mock_email_bot = MagicMock()
         mock_email_bot.summarize_inbox.side_effect = Exception("API接続エラー")
 
         coord = Coordinator(email_bot=mock_email_bot)
         result = coord.process_command("inbox")
 
-        assert result.success is False
-        assert "エラー" in result.message
+        assert_error(result)
 
     def test_schedule_error_handling(self):
         """schedule実行中のエラーハンドリング"""
-        mock_scheduler = Mock(spec=Scheduler)
+        mock_scheduler = MagicMock()
         mock_scheduler.propose_meeting.side_effect = Exception("カレンダーAPI接続エラー")
 
         coord = Coordinator(scheduler=mock_scheduler)
         result = coord.process_command("schedule meeting")
 
-        assert result.success is False
-        assert "エラー" in result.message
+        assert_error(result)
 
     def test_status_error_handling(self):
         """status実行中のエラーハンドリング"""
-        mock_scheduler = Mock(spec=Scheduler)
+        mock_scheduler = MagicMock()
         mock_scheduler.get_today_schedule.side_effect = Exception("予定取得エラー")
 
         coord = Coordinator(scheduler=mock_scheduler)
         result = coord.process_command("status")
 
-        assert result.success is False
-        assert "エラー" in result.message
+        assert_error(result)
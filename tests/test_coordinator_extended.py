@@ -12,10 +12,8 @@ coordinator.pyカバレッジ向上テスト
 
 import pytest
 import json
-import tempfile
-from pathlib import Path
-from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock, PropertyMock
+import shutil
+from unittest.mock import MagicMock
 
 from src.coordinator import (
     Coordinator,
@@ -28,38 +26,36 @@ from src.coordinator import (
 class TestDurationParseWarning:
     """duration パースエラー時のwarningログテスト"""
 
-    def test_invalid_duration_format_logs_warning(self) -> None:
+    def test_invalid_duration_format_logs_warning(self, mock_logger) -> None:
         """無効なduration形式でwarningログが出力される"""
         coord = Coordinator()
 
-        with patch('src.coordinator.logger') as mock_logger:
-            # 無効なduration形式を含むコマンド
-            result = coord.process_command("schedule meeting with test@example.com invalidmin")
-            # warningが呼ばれたことを確認
-            mock_logger.warning.assert_called()
+        # 無効なduration形式を含むコマンド
+        coord.process_command("schedule meeting with test@example.com invalidmin")
+        # warningが呼ばれたことを確認
+        mock_logger.warning.assert_called()
 
-    def test_non_numeric_duration(self) -> None:
+    def test_non_numeric_duration(self, mock_logger) -> None:
         """数値でないduration"""
         coord = Coordinator()
 
-        with patch('src.coordinator.logger') as mock_logger:
-            result = coord.process_command("schedule meeting abcmin")
-            mock_logger.warning.assert_called()
+        coord.process_command("schedule meeting abcmin")
+        mock_logger.warning.assert_called()
 
 
 class TestHandleConfirm:
     """_handle_confirm のテスト"""
 
-    def test_confirm_no_pending_actions(self) -> None:
+    def test_confirm_no_pending_actions(self, coordinator) -> None:
         """保留アクションがない場合のconfirm"""
-        coord = Coordinator()
+        coord = coordinator
         result = coord.process_command("confirm")
         assert result.success is False
         assert "確認待ちのアクションはありません" in result.message
 
-    def test_confirm_executes_action(self) -> None:
-        """保留アクションの実行"""
-        coord = Coordinator()
+    def test_confirm_executes_action_and_clears_pending(self, coordinator) -> None:
+        """保留アクションの実行とconfirm後のクリア"""
+        coord = coordinator
 
         # モックアクションを追加
         mock_action = Action(
@@ -75,10 +71,11 @@ class TestHandleConfirm:
         assert result.success is True
         assert "アクションを実行しました" in result.message
         mock_action.execute.assert_called_once()
+        assert len(coord._pending_actions) == 0
 
-    def test_confirm_action_execution_error(self) -> None:
+    def test_confirm_action_execution_error(self, coordinator) -> None:
         """アクション実行時のエラーハンドリング"""
-        coord = Coordinator()
+        coord = coordinator
 
         # エラーを発生させるモックアクション
         mock_action = Action(
@@ -94,36 +91,20 @@ class TestHandleConfirm:
         assert result.success is False
         assert "アクション実行エラー" in result.message
 
-    def test_confirm_clears_pending_actions(self) -> None:
-        """confirm後に保留アクションがクリアされる"""
-        coord = Coordinator()
-
-        mock_action = Action(
-            type=ActionType.EXTERNAL,
-            description="テストアクション",
-            execute=MagicMock(return_value=True),
-            requires_confirmation=True,
-            confirmed=False
-        )
-        coord._pending_actions = [mock_action]
-
-        coord.process_command("confirm")
-        assert len(coord._pending_actions) == 0
-
 
 class TestHandleCancel:
     """_handle_cancel のテスト"""
 
-    def test_cancel_no_pending_actions(self) -> None:
+    def test_cancel_no_pending_actions(self, coordinator) -> None:
         """保留アクションがない場合のcancel"""
-        coord = Coordinator()
+        coord = coordinator
         result = coord.process_command("cancel")
         assert result.success is True
         assert "キャンセルするアクションはありません" in result.message
 
-    def test_cancel_with_pending_actions(self) -> None:
+    def test_cancel_with_pending_actions(self, coordinator) -> None:
         """保留アクションがある場合のcancel"""
-        coord = Coordinator()
+        coord = coordinator
 
         # 複数のアクションを追加
         for i in range(3):
@@ -143,110 +124,70 @@ class TestHandleCancel:
         assert len(coord._pending_actions) == 0
 
 
-class TestLogAction:
-    """_log_action のテスト"""
-
-    def test_log_action_without_audit_log_path(self) -> None:
-        """audit_log_pathがない場合はログを書かない"""
-        coord = Coordinator(audit_log_path=None)
-        # エラーが発生しないことを確認
-        coord._log_action("test", "テスト")
-
-    def test_log_action_creates_new_log_file(self, tmp_path) -> None:
-        """新規ログファイルの作成"""
-        log_path = tmp_path / "audit.json"
-        coord = Coordinator(audit_log_path=str(log_path))
-
-        coord._log_action("user_action", "ユーザーアクション実行")
-
-        assert log_path.exists()
-        with open(log_path, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-        assert len(logs) == 1
-        assert logs[0]["action_type"] == "user_action"
-
-    def test_log_action_appends_to_existing_log(self, tmp_path) -> None:
-        """既存ログファイルへの追記"""
-        log_path = tmp_path / "audit.json"
-
-        # 既存ログを作成
-        existing_logs = [
-            {"timestamp": "2025-01-01T00:00:00", "action_type": "old", "description": "古いログ"}
-        ]
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_logs, f)
+# _log_actionのシナリオ表
+# audit_log: audit_log_pathを設定するか / seed: 事前に置くログ（existing=正常, invalid=不正JSON）
+# mock_target/side_effect: 例外を注入する対象 / expected_types: 書き込み後のaction_type一覧
+_LOG_ACTION_SCENARIOS = {
+    "without_audit_log_path": {"audit_log": False},
+    "creates_new_log_file": {"expected_types": ["user_action"]},
+    "appends_to_existing_log": {"seed": "existing", "expected_types": ["old", "user_action"]},
+    "json_decode_error": {"seed": "invalid", "expect_warning": True},
+    "permission_error": {
+        "mock_target": "builtins.open",
+        "side_effect": PermissionError("Permission denied"),
+        "expect_warning": True,
+    },
+    "general_exception": {
+        "mock_target": "pathlib.Path.exists",
+        "side_effect": OSError("Unexpected error"),
+        "expect_warning": True,
+    },
+}
 
-        coord = Coordinator(audit_log_path=str(log_path))
-        coord._log_action("new_action", "新しいアクション")
 
-        with open(log_path, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-        assert len(logs) == 2
-        assert logs[1]["action_type"] == "new_action"
+class TestLogAction:
+    """_log_action のテスト"""
 
-    def test_log_action_json_decode_error(self, tmp_path) -> None:
-        """JSONデコードエラー時のハンドリング"""
+    @pytest.mark.parametrize(
+        "scenario",
+        list(_LOG_ACTION_SCENARIOS.values()),
+        ids=list(_LOG_ACTION_SCENARIOS)
+    )
+    def test_log_action(self, scenario, tmp_path, seed_audit_log, monkeypatch, mock_logger) -> None:
+        """監査ログの作成・追記・例外ハンドリング"""
         log_path = tmp_path / "audit.json"
+        if scenario.get("seed") == "existing":
+            shutil.copy(seed_audit_log, log_path)
+        elif scenario.get("seed") == "invalid":
+            log_path.write_text("invalid json {{{", encoding="utf-8")
 
-        # 不正なJSONを作成
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write("invalid json {{{")
-
-        coord = Coordinator(audit_log_path=str(log_path))
-
-        with patch('src.coordinator.logger') as mock_logger:
-            coord._log_action("test", "テスト")
-            mock_logger.warning.assert_called()
+        audit_log_path = str(log_path) if scenario.get("audit_log", True) else None
+        coord = Coordinator(audit_log_path=audit_log_path)
 
-    def test_log_action_permission_error(self, tmp_path) -> None:
-        """書き込み権限エラー時のハンドリング"""
-        log_path = tmp_path / "readonly" / "audit.json"
-
-        coord = Coordinator(audit_log_path=str(log_path))
-
-        with patch('builtins.open', side_effect=PermissionError("Permission denied")):
-            with patch('src.coordinator.logger') as mock_logger:
-                coord._log_action("test", "テスト")
-                mock_logger.warning.assert_called()
-
-    def test_log_action_general_exception(self, tmp_path) -> None:
-        """一般的な例外のハンドリング"""
-        log_path = tmp_path / "audit.json"
+        with monkeypatch.context() as m:
+            if "mock_target" in scenario:
+                m.setattr(scenario["mock_target"], MagicMock(side_effect=scenario["side_effect"]))
+            coord._log_action("user_action", "ユーザーアクション実行")
 
-        coord = Coordinator(audit_log_path=str(log_path))
-
-        with patch.object(Path, 'exists', side_effect=OSError("Unexpected error")):
-            with patch('src.coordinator.logger') as mock_logger:
-                coord._log_action("test", "テスト")
-                mock_logger.warning.assert_called()
+        assert mock_logger.warning.called is scenario.get("expect_warning", False)
+        if "expected_types" in scenario:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                logs = json.load(f)
+            assert [log["action_type"] for log in logs] == scenario["expected_types"]
 
 
 class TestScheduleCommandParsing:
     """schedule コマンドのパーシングテスト"""
 
-    def test_schedule_with_valid_duration(self) -> None:
-        """有効なduration指定"""
-        coord = Coordinator()
-        result = coord.process_command("schedule meeting 60min")
-        # 結果を確認（スケジューラーのモックがなくても基本的な処理は行われる）
-        assert result is not None
-
-    def test_schedule_with_attendees(self) -> None:
-        """参加者指定付きスケジュール"""
-        coord = Coordinator()
-        result = coord.process_command("schedule meeting with user1@example.com user2@example.com")
-        assert result is not None
-
-    def test_schedule_with_title(self) -> None:
-        """タイトル付きスケジュール"""
-        coord = Coordinator()
-        result = coord.process_command("schedule Project Review Meeting")
-        assert result is not None
-
-    def test_schedule_ignores_common_words(self) -> None:
-        """'with'や'for'をタイトルから除外"""
-        coord = Coordinator()
-        result = coord.process_command("schedule meeting with team for review")
+    @pytest.mark.parametrize("command", [
+        "schedule meeting 60min",
+        "schedule meeting with user1@example.com user2@example.com",
+        "schedule Project Review Meeting",
+        "schedule meeting with team for review",
+    ], ids=["valid_duration", "attendees", "title", "ignores_common_words"])
+    def test_schedule_parses_without_error(self, coordinator, command) -> None:
+        """duration・参加者・タイトル指定のパース（スケジューラーのモックがなくても処理される）"""
+        result = coordinator.process_command(command)
         assert result is not None
 
 
@@ -320,31 +261,18 @@ class TestCoordinatorIntegration:
         assert result.success is True
         assert "ヘルプ" in result.message or "コマンド" in result.message
 
-    def test_process_status_command(self) -> None:
-        """statusコマンド"""
-        coord = Coordinator()
-        result = coord.process_command("status")
-        # statusコマンドは認証が必要な場合があるのでsuccessでなくてもよい
-        assert result is not None
-
-    def test_process_unknown_command(self) -> None:
-        """未知のコマンド"""
-        coord = Coordinator()
-        result = coord.process_command("unknown_command_xyz")
-        # 未知のコマンドでもエラーにはならない
+    @pytest.mark.parametrize("command", ["status", "unknown_command_xyz"])
+    def test_process_command_returns_result(self, default_coordinator, command) -> None:
+        """status（認証が必要な場合あり）・未知のコマンドでも例外にならない"""
+        result = default_coordinator.process_command(command)
         assert result is not None
 
-    def test_coordinator_with_email_bot(self) -> None:
-        """EmailBot付きCoordinatorの初期化"""
-        mock_email_bot = MagicMock()
-        coord = Coordinator(email_bot=mock_email_bot)
-        assert coord.email_bot is mock_email_bot
-
-    def test_coordinator_with_scheduler(self) -> None:
-        """Scheduler付きCoordinatorの初期化"""
-        mock_scheduler = MagicMock()
-        coord = Coordinator(scheduler=mock_scheduler)
-        assert coord.scheduler is mock_scheduler
+    @pytest.mark.parametrize("attr", ["email_bot", "scheduler"])
+    def test_coordinator_with_component(self, attr) -> None:
+        """EmailBot/Scheduler付きCoordinatorの初期化"""
+        component = MagicMock()
+        coord = Coordinator(**{attr: component})
+        assert getattr(coord, attr) is component
 
     def test_coordinator_full_init(self) -> None:
         """完全な初期化パラメータ"""
@@ -372,14 +300,13 @@ class TestConfirmationFlow:
         coord = Coordinator(confirmation_required=True)
         assert coord.confirmation_required is True
 
-    def test_confirmation_required_default(self) -> None:
+    def test_confirmation_required_default(self, default_coordinator) -> None:
         """デフォルトで確認必須"""
-        coord = Coordinator()
-        assert coord.confirmation_required is True
+        assert default_coordinator.confirmation_required is True
 
-    def test_pending_actions_list(self) -> None:
+    def test_pending_actions_list(self, coordinator) -> None:
         """保留アクションリストの管理"""
-        coord = Coordinator()
+        coord = coordinator
         assert coord._pending_actions == []
 
         # アクション追加
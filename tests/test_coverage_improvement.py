@@ -4,198 +4,187 @@
 cli.py、email_bot.py、scheduler.pyのカバレッジ向上を目的としたテスト
 """
 
-import pytest
+import base64
 import sys
-import os
+from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-from io import StringIO
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-
-# ============================================================
-# CLI テスト
-# ============================================================
-
-class TestCLIMain:
-    """cli.py main関数のテスト"""
-
-    def test_main_no_args_interactive(self):
-        """引数なしで対話モードを起動（モック）"""
-        from src import cli
-
-        with patch.object(cli, 'interactive_mode') as mock_interactive:
-            with patch.object(sys, 'argv', ['cli.py']):
-                cli.main()
-                mock_interactive.assert_called_once()
+from types import SimpleNamespace
+from unittest.mock import Mock
 
-    def test_main_auth_mode(self):
-        """auth引数で認証モードを起動（モック）"""
-        from src import cli
+import pytest
 
-        with patch.object(cli, 'auth_mode', return_value=0) as mock_auth:
-            with patch.object(sys, 'argv', ['cli.py', 'auth']):
-                with pytest.raises(SystemExit) as exc_info:
-                    cli.main()
-                mock_auth.assert_called_once()
-                assert exc_info.value.code == 0
+from src import cli
+from src.cli import print_banner
+from src.email_bot import EmailBot, summarize_text_offline
+from src.errors import EmailError, ScheduleError
+from src.llm import LLMResponse, LLMProvider
+from src.scheduler import Scheduler, TimeSlot
 
-    def test_main_help_flag(self, capsys):
-        """--helpフラグでヘルプを表示"""
-        from src import cli
 
-        with patch.object(sys, 'argv', ['cli.py', '--help']):
-            cli.main()
-            captured = capsys.readouterr()
-            assert "TaskMasterAI" in captured.out
-            assert "使用方法" in captured.out
+# Scheduler._serviceの認証チェック（真偽判定）を通すだけのスタブ
+_AUTH_SENTINEL = SimpleNamespace()
 
-    def test_main_h_flag(self, capsys):
-        """-hフラグでヘルプを表示"""
-        from src import cli
 
-        with patch.object(sys, 'argv', ['cli.py', '-h']):
-            cli.main()
-            captured = capsys.readouterr()
-            assert "TaskMasterAI" in captured.out
+# summarize_email用のLLM応答（失敗 / JSON以外の成功応答）
+_LLM_FAIL = LLMResponse(
+    success=False,
+    content="",
+    provider=LLMProvider.MOCK,
+    model="mock",
+    error_message="LLM error"
+)
+_LLM_BAD_JSON = LLMResponse(
+    success=True,
+    content="これはJSONではない応答です",
+    provider=LLMProvider.MOCK,
+    model="mock"
+)
 
-    def test_main_single_command(self):
-        """単一コマンドモード"""
-        from src import cli
+# src.email_bot/src.schedulerが参照する現在時刻（モジュール内で固定）
+_FIXED_NOW = datetime(2025, 1, 6, 10, 0)
 
-        with patch.object(cli, 'single_command_mode', return_value=0) as mock_single:
-            with patch.object(sys, 'argv', ['cli.py', 'status']):
-                with pytest.raises(SystemExit) as exc_info:
-                    cli.main()
-                mock_single.assert_called_once_with(['status'])
-                assert exc_info.value.code == 0
 
+@pytest.fixture(scope="module", autouse=True)
+def _frozen_now(frozen_clock):
+    """email_bot/schedulerの現在時刻をモジュール単位で固定"""
+    with pytest.MonkeyPatch.context() as mp:
+        frozen_clock(mp, "src.email_bot", "src.scheduler", now=_FIXED_NOW)
+        yield
 
-class TestCLIInteractiveMode:
-    """interactive_mode関数のテスト"""
 
-    def test_interactive_quit(self, capsys):
-        """quitで終了"""
-        from src import cli
+# _extract_body用の本文とbase64urlエンコード済みデータ
+_BODY_DIRECT = "これはテスト本文です"
+_ENCODED_BODY_DIRECT = base64.urlsafe_b64encode(_BODY_DIRECT.encode()).decode()
+_BODY_FROM_PARTS = "パートからの本文"
+_ENCODED_BODY_FROM_PARTS = base64.urlsafe_b64encode(_BODY_FROM_PARTS.encode()).decode()
 
-        with patch('builtins.input', side_effect=['quit']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "終了" in captured.out
 
-    def test_interactive_exit(self, capsys):
-        """exitで終了"""
-        from src import cli
-
-        with patch('builtins.input', side_effect=['exit']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "終了" in captured.out
+# ============================================================
+# CLI テスト
+# ============================================================
 
-    def test_interactive_q(self, capsys):
-        """qで終了"""
-        from src import cli
+class TestCLIMain:
+    """cli.py main関数のテスト"""
 
-        with patch('builtins.input', side_effect=['q']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "終了" in captured.out
+    def test_main_no_args_interactive(self, monkeypatch):
+        """引数なしで対話モードを起動（モック）"""
+        mock_interactive = Mock()
+        monkeypatch.setattr(cli, 'interactive_mode', mock_interactive)
+        monkeypatch.setattr(sys, 'argv', ['cli.py'])
+        cli.main()
+        mock_interactive.assert_called_once()
 
-    def test_interactive_empty_input(self, capsys):
-        """空入力はスキップ"""
-        from src import cli
+    def test_main_auth_mode(self, monkeypatch):
+        """auth引数で認証モードを起動（モック）"""
+        mock_auth = Mock(return_value=0)
+        monkeypatch.setattr(cli, 'auth_mode', mock_auth)
+        monkeypatch.setattr(sys, 'argv', ['cli.py', 'auth'])
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+        mock_auth.assert_called_once()
+        assert exc_info.value.code == 0
+
+    @pytest.mark.parametrize("flag", ['--help', '-h'])
+    def test_main_help_flag(self, capfd, monkeypatch, flag):
+        """--help/-hフラグでヘルプを表示"""
+        monkeypatch.setattr(sys, 'argv', ['cli.py', flag])
+        cli.main()
+        captured = capfd.readouterr()
+        assert "TaskMasterAI" in captured.out
+        assert "使用方法" in captured.out
+
+    def test_main_single_command(self, monkeypatch):
+        """単一コマンドモード"""
+        mock_single = Mock(return_value=0)
+        monkeypatch.setattr(cli, 'single_command_mode', mock_single)
+        monkeypatch.setattr(sys, 'argv', ['cli.py', 'status'])
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+        mock_single.assert_called_once_with(['status'])
+        assert exc_info.value.code == 0
 
-        with patch('builtins.input', side_effect=['', 'quit']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "終了" in captured.out
 
-    def test_interactive_help_then_quit(self, capsys):
-        """helpコマンド後にquit"""
-        from src import cli
+def _input_from(inputs):
+    """
+    builtins.inputの代替関数を作成
 
-        with patch('builtins.input', side_effect=['help', 'quit']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "コマンド" in captured.out or "終了" in captured.out
+    inputsが入力列なら順に返し、例外クラスなら呼び出し時に送出する。
+    Mockを使わず、呼び出し記録やside_effect解決のコストを避ける。
+    """
+    if isinstance(inputs, type) and issubclass(inputs, BaseException):
+        def fake_input(prompt=''):
+            raise inputs()
+        return fake_input
 
-    def test_interactive_keyboard_interrupt(self, capsys):
-        """Ctrl+Cで終了"""
-        from src import cli
+    it = iter(inputs)
+    return lambda prompt='': next(it)
 
-        with patch('builtins.input', side_effect=KeyboardInterrupt):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            assert "終了" in captured.out
 
-    def test_interactive_unknown_command_then_quit(self, capsys):
-        """不明なコマンド後にquit"""
-        from src import cli
+class TestCLIInteractiveMode:
+    """interactive_mode関数のテスト"""
 
+    @pytest.mark.parametrize("inputs", [
+        ('quit',),
+        ('exit',),
+        ('q',),
+        ('', 'quit'),
+        ('help', 'quit'),
+        KeyboardInterrupt,
         # 実際のCoordinatorを使用して不明コマンドを処理
-        with patch('builtins.input', side_effect=['unknown_xyz_command', 'quit']):
-            cli.interactive_mode()
-            captured = capsys.readouterr()
-            # 不明なコマンドのエラーと終了メッセージが表示される
-            assert "終了" in captured.out
+        ('unknown_xyz_command', 'quit'),
+    ], ids=["quit", "exit", "q", "empty_input", "help_then_quit", "keyboard_interrupt",
+            "unknown_command_then_quit"])
+    def test_interactive_terminates(self, capfd, monkeypatch, inputs):
+        """quit/exit/q/Ctrl+C等で終了メッセージを表示して終了"""
+        monkeypatch.setattr('builtins.input', _input_from(inputs))
+        cli.interactive_mode()
+        captured = capfd.readouterr()
+        assert "終了" in captured.out
 
 
 class TestCLIAuthMode:
     """auth_mode関数のテスト"""
 
-    def test_auth_mode_calls_authenticate(self, capsys):
-        """auth_modeが認証メソッドを呼び出す"""
-        from src import cli
-
-        # src.email_botとsrc.schedulerモジュールをパッチ
-        with patch('src.email_bot.EmailBot') as mock_email_class:
-            with patch('src.scheduler.Scheduler') as mock_scheduler_class:
-                mock_email_bot = Mock()
-                mock_email_bot.authenticate.return_value = True
-                mock_email_class.return_value = mock_email_bot
-
-                mock_scheduler = Mock()
-                mock_scheduler.authenticate.return_value = True
-                mock_scheduler_class.return_value = mock_scheduler
-
-                result = cli.auth_mode()
-                # 認証が呼び出される
-                mock_email_bot.authenticate.assert_called_once()
-                mock_scheduler.authenticate.assert_called_once()
-                assert result == 0
-
-    def test_auth_mode_both_fail(self, capsys):
-        """両方の認証が失敗"""
-        from src import cli
-
-        with patch('src.email_bot.EmailBot') as mock_email_class:
-            with patch('src.scheduler.Scheduler') as mock_scheduler_class:
-                mock_email_bot = Mock()
-                mock_email_bot.authenticate.return_value = False
-                mock_email_class.return_value = mock_email_bot
-
-                mock_scheduler = Mock()
-                mock_scheduler.authenticate.return_value = False
-                mock_scheduler_class.return_value = mock_scheduler
-
-                result = cli.auth_mode()
-                assert result == 1
-                captured = capsys.readouterr()
-                # 失敗メッセージが表示される
-                assert "❌" in captured.out or "失敗" in captured.out
+    @pytest.fixture
+    def auth_mocks(self, monkeypatch, request):
+        """
+        認証結果を指定したEmailBot/Schedulerのモックを注入
+
+        request.paramは (Gmail認証結果, Calendar認証結果)。
+        """
+        email_success, calendar_success = request.param
+        email_bot = Mock()
+        email_bot.authenticate.return_value = email_success
+        scheduler = Mock()
+        scheduler.authenticate.return_value = calendar_success
+        monkeypatch.setattr('src.email_bot.EmailBot', lambda *args, **kwargs: email_bot)
+        monkeypatch.setattr('src.scheduler.Scheduler', lambda *args, **kwargs: scheduler)
+        return email_bot, scheduler
+
+    @pytest.mark.parametrize("auth_mocks,expected_code,expected_mark", [
+        ((True, True), 0, "✅"),
+        ((False, False), 1, "❌"),
+    ], indirect=["auth_mocks"], ids=["both_succeed", "both_fail"])
+    def test_auth_mode(self, capfd, auth_mocks, expected_code, expected_mark):
+        """auth_modeが両方の認証を呼び出し、結果に応じた終了コードを返す"""
+        email_bot, scheduler = auth_mocks
+
+        result = cli.auth_mode()
+
+        email_bot.authenticate.assert_called_once()
+        scheduler.authenticate.assert_called_once()
+        assert result == expected_code
+        assert expected_mark in capfd.readouterr().out
 
 
 class TestCLIPrintBanner:
     """print_banner関数のテスト"""
 
-    def test_banner_contains_ascii_art(self, capsys):
+    def test_banner_contains_ascii_art(self, capfd):
         """バナーにASCIIアートが含まれる"""
-        from src.cli import print_banner
-
         print_banner()
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         # ASCIIアートボックスまたはロゴが含まれる
         assert "╔" in captured.out or "TASK" in captured.out or "TaskMaster" in captured.out
 
@@ -207,20 +196,16 @@ class TestCLIPrintBanner:
 class TestEmailBotAuthenticate:
     """EmailBot.authenticate()のテスト"""
 
-    def test_authenticate_import_error(self):
+    def test_authenticate_import_error(self, monkeypatch):
         """Google APIライブラリがない場合"""
-        from src.email_bot import EmailBot
-
-        with patch.dict(sys.modules, {'google.oauth2.credentials': None}):
-            bot = EmailBot()
-            # ImportErrorが発生してFalseを返す
-            result = bot.authenticate()
-            assert result is False
+        monkeypatch.setitem(sys.modules, 'google.oauth2.credentials', None)
+        bot = EmailBot()
+        # ImportErrorが発生してFalseを返す
+        result = bot.authenticate()
+        assert result is False
 
     def test_authenticate_file_not_found(self):
         """認証情報ファイルがない場合"""
-        from src.email_bot import EmailBot
-
         bot = EmailBot(credentials_path=Path("/nonexistent/path/oauth.json"))
         result = bot.authenticate()
         assert result is False
@@ -229,50 +214,27 @@ class TestEmailBotAuthenticate:
 class TestEmailBotFetchUnreadEmails:
     """EmailBot.fetch_unread_emails()のテスト"""
 
-    def test_fetch_without_auth(self):
+    def test_fetch_without_auth(self, unauthed_emailbot):
         """認証なしでの取得はエラー"""
-        from src.email_bot import EmailBot
-        from src.errors import EmailError
-
-        bot = EmailBot()
         # _serviceがNoneの状態
-        with pytest.raises(EmailError):
-            bot.fetch_unread_emails()
+        with pytest.raises(EmailError, match="認証されていません"):
+            unauthed_emailbot.fetch_unread_emails()
 
 
 class TestEmailBotParseMessage:
     """EmailBot._parse_message()のテスト"""
 
-    def test_parse_message_valid(self):
+    def test_parse_message_valid(self, sample_gmail_message):
         """有効なメッセージのパース"""
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
-        msg = {
-            'id': 'msg123',
-            'threadId': 'thread123',
-            'snippet': 'テストスニペット',
-            'labelIds': ['INBOX', 'UNREAD'],
-            'payload': {
-                'headers': [
-                    {'name': 'Subject', 'value': 'テスト件名'},
-                    {'name': 'From', 'value': 'sender@example.com'},
-                    {'name': 'To', 'value': 'recipient@example.com'},
-                    {'name': 'Date', 'value': 'Mon, 6 Jan 2025 10:00:00 +0900'},
-                ],
-                'body': {'data': ''}
-            }
-        }
 
-        email = bot._parse_message(msg)
+        email = bot._parse_message(sample_gmail_message)
         assert email is not None
         assert email.id == 'msg123'
         assert email.subject == 'テスト件名'
 
     def test_parse_message_missing_field(self):
         """必須フィールド欠落"""
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
         msg = {
             'id': 'msg123',
@@ -283,29 +245,24 @@ class TestEmailBotParseMessage:
         email = bot._parse_message(msg)
         assert email is None
 
-    def test_parse_message_invalid_date(self):
+    def test_parse_message_invalid_date(self, sample_gmail_message):
         """無効な日付形式"""
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
+        payload = sample_gmail_message['payload']
         msg = {
-            'id': 'msg123',
-            'threadId': 'thread123',
-            'snippet': 'テスト',
-            'labelIds': ['INBOX'],
+            **sample_gmail_message,
             'payload': {
+                **payload,
                 'headers': [
-                    {'name': 'Subject', 'value': 'テスト'},
-                    {'name': 'From', 'value': 'sender@example.com'},
-                    {'name': 'To', 'value': 'recipient@example.com'},
-                    {'name': 'Date', 'value': 'invalid-date'},
-                ],
-                'body': {'data': ''}
+                    h if h['name'] != 'Date' else {'name': 'Date', 'value': 'invalid-date'}
+                    for h in payload['headers']
+                ]
             }
         }
 
         email = bot._parse_message(msg)
         assert email is not None  # 日付パース失敗でも現在時刻で作成される
+        assert email.date == _FIXED_NOW
 
 
 class TestEmailBotExtractBody:
@@ -313,44 +270,30 @@ class TestEmailBotExtractBody:
 
     def test_extract_body_direct(self):
         """直接本文データ"""
-        import base64
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
-        body_text = "これはテスト本文です"
-        encoded = base64.urlsafe_b64encode(body_text.encode()).decode()
-
         payload = {
-            'body': {'data': encoded}
+            'body': {'data': _ENCODED_BODY_DIRECT}
         }
 
         result = bot._extract_body(payload)
-        assert result == body_text
+        assert result == _BODY_DIRECT
 
     def test_extract_body_from_parts(self):
         """partsから本文抽出"""
-        import base64
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
-        body_text = "パートからの本文"
-        encoded = base64.urlsafe_b64encode(body_text.encode()).decode()
-
         payload = {
             'body': {},
             'parts': [
                 {'mimeType': 'text/html', 'body': {'data': 'html'}},
-                {'mimeType': 'text/plain', 'body': {'data': encoded}},
+                {'mimeType': 'text/plain', 'body': {'data': _ENCODED_BODY_FROM_PARTS}},
             ]
         }
 
         result = bot._extract_body(payload)
-        assert result == body_text
+        assert result == _BODY_FROM_PARTS
 
     def test_extract_body_empty(self):
         """本文なし"""
-        from src.email_bot import EmailBot
-
         bot = EmailBot()
         payload = {'body': {}}
 
@@ -361,62 +304,21 @@ class TestEmailBotExtractBody:
 class TestEmailBotSummarizeEmail:
     """EmailBot.summarize_email()のテスト"""
 
-    def test_summarize_email_llm_failure(self):
+    def test_summarize_email_llm_failure(self, mock_llm_service, sample_email):
         """LLM応答失敗時"""
-        from src.email_bot import EmailBot, Email
-        from src.llm import LLMResponse, LLMProvider
-
-        mock_llm = Mock()
-        mock_llm.analyze_email.return_value = LLMResponse(
-            success=False,
-            content="",
-            provider=LLMProvider.MOCK,
-            model="mock",
-            error_message="LLM error"
-        )
+        mock_llm_service.analyze_email.return_value = _LLM_FAIL
 
-        bot = EmailBot(llm_service=mock_llm)
-        email = Email(
-            id="test1",
-            thread_id="thread1",
-            subject="テスト",
-            sender="sender@example.com",
-            recipient="recipient@example.com",
-            date=datetime.now(),
-            body="テスト本文",
-            snippet="テスト"
-        )
-
-        summary = bot.summarize_email(email)
+        bot = EmailBot(llm_service=mock_llm_service)
+        summary = bot.summarize_email(sample_email)
         assert summary.email_id == "test1"
         assert "失敗" in summary.summary
 
-    def test_summarize_email_invalid_json(self):
+    def test_summarize_email_invalid_json(self, mock_llm_service, sample_email):
         """LLM応答がJSON不正"""
-        from src.email_bot import EmailBot, Email
-        from src.llm import LLMResponse, LLMProvider
-
-        mock_llm = Mock()
-        mock_llm.analyze_email.return_value = LLMResponse(
-            success=True,
-            content="これはJSONではない応答です",
-            provider=LLMProvider.MOCK,
-            model="mock"
-        )
+        mock_llm_service.analyze_email.return_value = _LLM_BAD_JSON
 
-        bot = EmailBot(llm_service=mock_llm)
-        email = Email(
-            id="test2",
-            thread_id="thread2",
-            subject="テスト",
-            sender="sender@example.com",
-            recipient="recipient@example.com",
-            date=datetime.now(),
-            body="テスト本文",
-            snippet="テスト"
-        )
-
-        summary = bot.summarize_email(email)
+        bot = EmailBot(llm_service=mock_llm_service)
+        summary = bot.summarize_email(replace(sample_email, id="test2"))
         assert summary.email_id == "test2"
         # JSONパース失敗時は内容の一部が要約に入る
         assert len(summary.summary) > 0
@@ -425,14 +327,10 @@ class TestEmailBotSummarizeEmail:
 class TestEmailBotCreateDraft:
     """EmailBot.create_draft()のテスト"""
 
-    def test_create_draft_without_auth(self):
+    def test_create_draft_without_auth(self, unauthed_emailbot):
         """認証なしでの下書き作成"""
-        from src.email_bot import EmailBot
-        from src.errors import EmailError
-
-        bot = EmailBot()
-        with pytest.raises(EmailError):
-            bot.create_draft("to@example.com", "件名", "本文")
+        with pytest.raises(EmailError, match="認証されていません"):
+            unauthed_emailbot.create_draft("to@example.com", "件名", "本文")
 
 
 # ============================================================
@@ -442,19 +340,15 @@ class TestEmailBotCreateDraft:
 class TestSchedulerAuthenticate:
     """Scheduler.authenticate()のテスト"""
 
-    def test_authenticate_import_error(self):
+    def test_authenticate_import_error(self, monkeypatch):
         """Calendar APIライブラリがない場合"""
-        from src.scheduler import Scheduler
-
-        with patch.dict(sys.modules, {'google.oauth2.credentials': None}):
-            scheduler = Scheduler()
-            result = scheduler.authenticate()
-            assert result is False
+        monkeypatch.setitem(sys.modules, 'google.oauth2.credentials', None)
+        scheduler = Scheduler()
+        result = scheduler.authenticate()
+        assert result is False
 
     def test_authenticate_file_not_found(self):
         """認証情報ファイルがない場合"""
-        from src.scheduler import Scheduler
-
         scheduler = Scheduler(credentials_path=Path("/nonexistent/oauth.json"))
         result = scheduler.authenticate()
         assert result is False
@@ -463,57 +357,34 @@ class TestSchedulerAuthenticate:
 class TestSchedulerGetEvents:
     """Scheduler.get_events()のテスト"""
 
-    def test_get_events_without_auth(self):
+    def test_get_events_without_auth(self, unauthed_scheduler):
         """認証なしでのイベント取得"""
-        from src.scheduler import Scheduler
-        from src.errors import ScheduleError
-
-        scheduler = Scheduler()
-        with pytest.raises(ScheduleError):
-            scheduler.get_events()
+        with pytest.raises(ScheduleError, match="認証されていません"):
+            unauthed_scheduler.get_events()
 
 
 class TestSchedulerParseEvent:
     """Scheduler._parse_event()のテスト"""
 
-    def test_parse_event_datetime(self):
+    def test_parse_event_datetime(self, sample_calendar_event_datetime):
         """日時イベントのパース"""
-        from src.scheduler import Scheduler
-
         scheduler = Scheduler()
-        item = {
-            'id': 'event123',
-            'summary': 'ミーティング',
-            'start': {'dateTime': '2025-01-06T10:00:00+09:00'},
-            'end': {'dateTime': '2025-01-06T11:00:00+09:00'},
-            'attendees': [{'email': 'alice@example.com'}]
-        }
 
-        event = scheduler._parse_event(item)
+        event = scheduler._parse_event(sample_calendar_event_datetime)
         assert event is not None
         assert event.id == 'event123'
         assert event.is_all_day is False
 
-    def test_parse_event_all_day(self):
+    def test_parse_event_all_day(self, sample_calendar_event_allday):
         """終日イベントのパース"""
-        from src.scheduler import Scheduler
-
         scheduler = Scheduler()
-        item = {
-            'id': 'event456',
-            'summary': '休暇',
-            'start': {'date': '2025-01-06'},
-            'end': {'date': '2025-01-07'}
-        }
 
-        event = scheduler._parse_event(item)
+        event = scheduler._parse_event(sample_calendar_event_allday)
         assert event is not None
         assert event.is_all_day is True
 
     def test_parse_event_missing_field(self):
         """必須フィールド欠落"""
-        from src.scheduler import Scheduler
-
         scheduler = Scheduler()
         item = {
             'id': 'event789',
@@ -527,50 +398,41 @@ class TestSchedulerParseEvent:
 class TestSchedulerCreateEvent:
     """Scheduler.create_event()のテスト"""
 
-    def test_create_event_without_auth(self):
+    def test_create_event_without_auth(self, unauthed_scheduler, future_tokyo_range):
         """認証なしでのイベント作成"""
-        from src.scheduler import Scheduler
-        from src.errors import ScheduleError
-
-        scheduler = Scheduler()
-        with pytest.raises(ScheduleError):
-            scheduler.create_event(
+        start, _ = future_tokyo_range
+        with pytest.raises(ScheduleError, match="認証されていません"):
+            unauthed_scheduler.create_event(
                 title="テスト",
-                start=datetime.now(),
-                end=datetime.now() + timedelta(hours=1)
+                start=start,
+                end=start + timedelta(hours=1)
             )
 
 
 class TestSchedulerGetTodaySchedule:
     """Scheduler.get_today_schedule()のテスト"""
 
-    def test_get_today_schedule_calls_get_events(self):
+    def test_get_today_schedule_calls_get_events(self, monkeypatch):
         """get_today_scheduleがget_eventsを呼び出す"""
-        from src.scheduler import Scheduler
-
         scheduler = Scheduler()
-        scheduler._service = Mock()  # 認証済みを偽装
+        scheduler._service = _AUTH_SENTINEL  # 認証済みを偽装
 
-        with patch.object(scheduler, 'get_events', return_value=[]) as mock_get:
-            result = scheduler.get_today_schedule()
-            mock_get.assert_called_once()
-            assert result == []
+        mock_get = Mock(return_value=[])
+        monkeypatch.setattr(scheduler, 'get_events', mock_get)
+        result = scheduler.get_today_schedule()
+        mock_get.assert_called_once()
+        assert result == []
 
 
 class TestSchedulerGenerateCandidateSlots:
     """Scheduler._generate_candidate_slots()のテスト"""
 
-    def test_generate_slots_within_working_hours(self):
+    def test_generate_slots_within_working_hours(self, future_tokyo_range):
         """営業時間内のスロット生成"""
-        from src.scheduler import Scheduler
-        from zoneinfo import ZoneInfo
-
         scheduler = Scheduler()
-        tz = ZoneInfo("Asia/Tokyo")
 
         # 未来の日付を使用
-        start = datetime(2099, 1, 6, 0, 0, tzinfo=tz)
-        end = datetime(2099, 1, 6, 23, 59, tzinfo=tz)
+        start, end = future_tokyo_range
 
         slots = scheduler._generate_candidate_slots(start, end, 30)
 
@@ -579,18 +441,15 @@ class TestSchedulerGenerateCandidateSlots:
             assert slot.start.hour >= scheduler.working_hours_start
             assert slot.end.hour <= scheduler.working_hours_end
 
-    def test_generate_slots_skip_weekends(self):
+    def test_generate_slots_skip_weekends(self, future_tokyo_range):
         """週末をスキップ"""
-        from src.scheduler import Scheduler
-        from zoneinfo import ZoneInfo
-
         scheduler = Scheduler()
-        tz = ZoneInfo("Asia/Tokyo")
+        tz_tokyo = future_tokyo_range[0].tzinfo
 
         # 土曜日のみを対象
         # 2099年1月2日が土曜日と仮定して検索
-        saturday = datetime(2099, 1, 4, 0, 0, tzinfo=tz)  # 実際の曜日は確認が必要
-        sunday = datetime(2099, 1, 5, 23, 59, tzinfo=tz)
+        saturday = datetime(2099, 1, 4, 0, 0, tzinfo=tz_tokyo)  # 実際の曜日は確認が必要
+        sunday = datetime(2099, 1, 5, 23, 59, tzinfo=tz_tokyo)
 
         slots = scheduler._generate_candidate_slots(saturday, sunday, 30)
 
@@ -602,12 +461,10 @@ class TestSchedulerGenerateCandidateSlots:
 class TestSchedulerProposeMeeting:
     """Scheduler.propose_meeting()のテスト"""
 
-    def test_propose_meeting_scoring(self):
+    def test_propose_meeting_scoring(self, monkeypatch):
         """会議提案のスコアリング"""
-        from src.scheduler import Scheduler, TimeSlot
-
         scheduler = Scheduler()
-        scheduler._service = Mock()  # 認証済み偽装
+        scheduler._service = _AUTH_SENTINEL  # 認証済み偽装
 
         # find_free_slotsをモック
         mock_slots = [
@@ -621,16 +478,16 @@ class TestSchedulerProposeMeeting:
             )
         ]
 
-        with patch.object(scheduler, 'find_free_slots', return_value=mock_slots):
-            proposals = scheduler.propose_meeting(
-                title="テスト会議",
-                duration_minutes=30,
-                attendees=["alice@example.com"]
-            )
+        monkeypatch.setattr(scheduler, 'find_free_slots', Mock(return_value=mock_slots))
+        proposals = scheduler.propose_meeting(
+            title="テスト会議",
+            duration_minutes=30,
+            attendees=["alice@example.com"]
+        )
 
-            assert len(proposals) == 2
-            # 10時のスロットは高スコア、17時は低スコア
-            # スコア順にソートされている
+        assert len(proposals) == 2
+        # 10時のスロットは高スコア、17時は低スコア
+        # スコア順にソートされている
 
 
 # ============================================================
@@ -640,23 +497,16 @@ class TestSchedulerProposeMeeting:
 class TestSummarizeTextOfflineEdgeCases:
     """summarize_text_offline()のエッジケーステスト"""
 
-    def test_exact_max_length(self):
-        """ちょうどmax_length"""
-        from src.email_bot import summarize_text_offline
-
-        text = "あ" * 100
-        result = summarize_text_offline(text, max_length=100)
-        assert result == text
-
-    def test_with_exclamation(self):
-        """！で終わる文"""
-        from src.email_bot import summarize_text_offline
-
-        # 十分長いテキストで、！が途中にある
-        text = "これは最初の文！" + "あ" * 100 + "。"
-        result = summarize_text_offline(text, max_length=30)
-        # 文の区切りで切るか、...で終わる
-        assert result.endswith("！") or result.endswith("...")
+    @pytest.mark.parametrize("text,max_length,check", [
+        # ちょうどmax_lengthならそのまま返す
+        ("あ" * 100, 100, lambda r: r == "あ" * 100),
+        # 十分長いテキストで、！が途中にある → 文の区切りで切るか、...で終わる
+        ("これは最初の文！" + "あ" * 100 + "。", 30,
+         lambda r: r.endswith("！") or r.endswith("...")),
+    ], ids=["exact_max_length", "with_exclamation"])
+    def test_summarize_text_offline_edges(self, text, max_length, check):
+        """max_length境界と文区切りでの切り詰め"""
+        assert check(summarize_text_offline(text, max_length=max_length))
 
 
 if __name__ == "__main__":
@@ -5,29 +5,11 @@ SQLite永続化層のテスト
 """
 
 import pytest
-from datetime import datetime, timedelta
-import tempfile
-import os
+import sqlite3
+import threading
+from datetime import datetime
 
-from src.database import (
-    Database,
-    DBUser,
-    DBSubscription,
-    DBUsageRecord,
-    create_database
-)
-
-
-@pytest.fixture
-def db():
-    """
-    テスト用データベースフィクスチャ
-
-    テスト終了後に自動でclose()される
-    """
-    database = Database()
-    yield database
-    database.close()
+from src.database import Database, create_database
 
 
 class TestDatabaseInitialization:
@@ -38,12 +20,39 @@ class TestDatabaseInitialization:
         db = Database()
         assert db.db_path == ":memory:"
 
-    def test_file_database(self, tmp_path):
+    def test_file_database(self, ramdisk_path):
         """ファイルデータベースの作成"""
-        db_path = str(tmp_path / "test.db")
-        db = Database(db_path)
-        assert db.db_path == db_path
-        assert os.path.exists(db_path)
+        db_path = ramdisk_path / "test.db"
+        db = Database(str(db_path), tuning="fast")
+        assert db.db_path == str(db_path)
+        assert db_path.is_file()
+
+    def test_injected_connection(self):
+        """注入した接続を共有し、close()では閉じない"""
+        conn = sqlite3.connect(":memory:")
+        db1 = Database(conn=conn)
+        db2 = Database(conn=conn)
+        db1.create_user(user_id="shared-user", email="shared@example.com", password_hash="hash")
+        assert db2.get_user_by_id("shared-user") is not None
+
+        db1.close()
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+        conn.close()
+
+    @pytest.mark.parametrize("tuning,journal_mode", [
+        ("safe", "delete"),
+        ("fast", "wal"),
+    ])
+    def test_tuning_journal_mode(self, ramdisk_path, tuning, journal_mode):
+        """tuningに応じたジャーナルモード"""
+        db = Database(str(ramdisk_path / "tuning.db"), tuning=tuning)
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == journal_mode
+
+    def test_invalid_tuning(self):
+        """不明なtuningはエラー"""
+        with pytest.raises(ValueError):
+            Database(tuning="turbo")
 
     def test_create_database_helper(self):
         """create_database関数のテスト"""
@@ -55,25 +64,34 @@ class TestDatabaseInitialization:
 class TestUserOperations:
     """ユーザー操作テスト"""
 
-    def test_create_user(self):
-        """ユーザー作成"""
-        db = Database()
+    @pytest.mark.parametrize("user_id,email,name,plan,expect_plan", [
+        ("user-123", "test@example.com", "Test User", None, "free"),
+        ("user-456", "user456@example.com", None, None, "free"),
+        ("pro-user", "pro@example.com", "Pro User", "pro", "pro"),
+        ("special-user", "special@example.com", "O'Brien \"Test\" <User>", None, "free"),
+    ], ids=["basic", "without_name", "with_plan", "special_characters"])
+    def test_create_user_variants(self, db, user_id, email, name, plan, expect_plan):
+        """ユーザー作成とID・メールアドレスでの取得"""
+        kwargs = {"plan": plan} if plan else {}
         user = db.create_user(
-            user_id="user-123",
-            email="test@example.com",
-            password_hash="hashed_password",
-            name="Test User"
+            user_id=user_id,
+            email=email,
+            password_hash="hash",
+            name=name,
+            **kwargs
         )
 
         assert user is not None
-        assert user.id == "user-123"
-        assert user.email == "test@example.com"
-        assert user.name == "Test User"
-        assert user.plan == "free"
+        assert (user.id, user.email, user.name, user.plan) == (user_id, email, name, expect_plan)
+
+        by_id = db.get_user_by_id(user_id)
+        by_email = db.get_user_by_email(email)
+        assert by_id is not None and by_email is not None
+        assert (by_id.email, by_id.name, by_id.plan) == (email, name, expect_plan)
+        assert by_email.id == user_id
 
-    def test_create_duplicate_user(self):
+    def test_create_duplicate_user(self, db):
         """重複ユーザー作成の防止"""
-        db = Database()
         db.create_user(
             user_id="user-1",
             email="test@example.com",
@@ -89,41 +107,13 @@ class TestUserOperations:
 
         assert duplicate is None
 
-    def test_get_user_by_id(self):
-        """IDでユーザー取得"""
-        db = Database()
-        db.create_user(
-            user_id="user-456",
-            email="user456@example.com",
-            password_hash="hash"
-        )
-
-        user = db.get_user_by_id("user-456")
-        assert user is not None
-        assert user.email == "user456@example.com"
-
-    def test_get_user_by_email(self):
-        """メールアドレスでユーザー取得"""
-        db = Database()
-        db.create_user(
-            user_id="user-789",
-            email="findme@example.com",
-            password_hash="hash"
-        )
-
-        user = db.get_user_by_email("findme@example.com")
-        assert user is not None
-        assert user.id == "user-789"
-
-    def test_get_nonexistent_user(self):
+    def test_get_nonexistent_user(self, db):
         """存在しないユーザーの取得"""
-        db = Database()
         user = db.get_user_by_id("nonexistent")
         assert user is None
 
-    def test_update_user(self):
+    def test_update_user(self, db):
         """ユーザー更新"""
-        db = Database()
         db.create_user(
             user_id="update-user",
             email="update@example.com",
@@ -143,9 +133,8 @@ class TestUserOperations:
         assert user.name == "Updated Name"
         assert user.plan == "personal"
 
-    def test_update_user_stripe_id(self):
+    def test_update_user_stripe_id(self, db):
         """StripeカスタマーID更新"""
-        db = Database()
         db.create_user(
             user_id="stripe-user",
             email="stripe@example.com",
@@ -160,9 +149,8 @@ class TestUserOperations:
         user = db.get_user_by_id("stripe-user")
         assert user.stripe_customer_id == "cus_12345"
 
-    def test_update_nonexistent_user(self):
+    def test_update_nonexistent_user(self, db):
         """存在しないユーザーの更新"""
-        db = Database()
         result = db.update_user(
             user_id="nonexistent",
             name="New Name"
@@ -173,9 +161,13 @@ class TestUserOperations:
 class TestSubscriptionOperations:
     """サブスクリプション操作テスト"""
 
-    def test_create_subscription(self):
-        """サブスクリプション作成"""
-        db = Database()
+    @pytest.mark.parametrize("subscription_id,plan,stripe_subscription_id", [
+        ("sub-123", "personal", None),
+        ("get-sub", "pro", None),
+        ("stripe-sub", "personal", "sub_stripe123"),
+    ], ids=["personal", "pro", "with_stripe"])
+    def test_create_subscription_variants(self, db, subscription_id, plan, stripe_subscription_id):
+        """サブスクリプション作成とユーザーIDでの取得"""
         db.create_user(
             user_id="sub-user",
             email="sub@example.com",
@@ -183,43 +175,28 @@ class TestSubscriptionOperations:
         )
 
         sub = db.create_subscription(
-            subscription_id="sub-123",
+            subscription_id=subscription_id,
             user_id="sub-user",
-            plan="personal"
+            plan=plan,
+            stripe_subscription_id=stripe_subscription_id
         )
 
         assert sub is not None
-        assert sub.id == "sub-123"
-        assert sub.plan == "personal"
-        assert sub.status == "active"
-
-    def test_get_subscription_by_user(self):
-        """ユーザーIDでサブスクリプション取得"""
-        db = Database()
-        db.create_user(
-            user_id="get-sub-user",
-            email="getsub@example.com",
-            password_hash="hash"
-        )
-        db.create_subscription(
-            subscription_id="get-sub",
-            user_id="get-sub-user",
-            plan="pro"
-        )
+        assert (sub.id, sub.plan, sub.status) == (subscription_id, plan, "active")
+        assert sub.stripe_subscription_id == stripe_subscription_id
 
-        sub = db.get_subscription_by_user("get-sub-user")
-        assert sub is not None
-        assert sub.plan == "pro"
+        fetched = db.get_subscription_by_user("sub-user")
+        assert fetched is not None
+        assert (fetched.id, fetched.plan) == (subscription_id, plan)
+        assert fetched.stripe_subscription_id == stripe_subscription_id
 
-    def test_get_nonexistent_subscription(self):
+    def test_get_nonexistent_subscription(self, db):
         """存在しないサブスクリプションの取得"""
-        db = Database()
         sub = db.get_subscription_by_user("no-sub-user")
         assert sub is None
 
-    def test_update_subscription(self):
+    def test_update_subscription(self, db):
         """サブスクリプション更新"""
-        db = Database()
         db.create_user(
             user_id="upd-sub-user",
             email="updsub@example.com",
@@ -242,34 +219,12 @@ class TestSubscriptionOperations:
         sub = db.get_subscription_by_user("upd-sub-user")
         assert sub.plan == "pro"
 
-    def test_subscription_with_stripe(self):
-        """Stripeサブスクリプション連携"""
-        db = Database()
-        db.create_user(
-            user_id="stripe-sub-user",
-            email="stripesub@example.com",
-            password_hash="hash"
-        )
-
-        sub = db.create_subscription(
-            subscription_id="stripe-sub",
-            user_id="stripe-sub-user",
-            plan="personal",
-            stripe_subscription_id="sub_stripe123"
-        )
-
-        assert sub.stripe_subscription_id == "sub_stripe123"
-
-
 class TestUsageOperations:
     """使用量操作テスト"""
 
-    def test_record_usage(self):
+    def test_record_usage(self, db, usage_period):
         """使用量記録"""
-        db = Database()
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = period_start + timedelta(days=30)
+        period_start, period_end = usage_period
 
         count = db.record_usage(
             user_id="usage-user",
@@ -280,12 +235,9 @@ class TestUsageOperations:
 
         assert count == 1
 
-    def test_increment_usage(self):
+    def test_increment_usage(self, db, usage_period):
         """使用量インクリメント"""
-        db = Database()
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = period_start + timedelta(days=30)
+        period_start, period_end = usage_period
 
         # 3回記録
         db.record_usage("inc-user", "email_summary", period_start, period_end)
@@ -294,12 +246,9 @@ class TestUsageOperations:
 
         assert count == 3
 
-    def test_get_usage(self):
+    def test_get_usage(self, db, usage_period):
         """使用量取得"""
-        db = Database()
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = period_start + timedelta(days=30)
+        period_start, period_end = usage_period
 
         db.record_usage("get-usage-user", "email_summary", period_start, period_end)
         db.record_usage("get-usage-user", "email_summary", period_start, period_end)
@@ -307,21 +256,16 @@ class TestUsageOperations:
         count = db.get_usage("get-usage-user", "email_summary", period_start)
         assert count == 2
 
-    def test_get_zero_usage(self):
+    def test_get_zero_usage(self, db, usage_period):
         """未使用の取得"""
-        db = Database()
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
+        period_start, _ = usage_period
 
         count = db.get_usage("no-usage-user", "email_summary", period_start)
         assert count == 0
 
-    def test_get_all_usage(self):
+    def test_get_all_usage(self, db, usage_period):
         """全機能の使用量取得"""
-        db = Database()
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = period_start + timedelta(days=30)
+        period_start, period_end = usage_period
 
         # 複数機能の使用量を記録
         db.record_usage("all-usage-user", "email_summary", period_start, period_end)
@@ -333,9 +277,8 @@ class TestUsageOperations:
         assert all_usage["email_summary"] == 2
         assert all_usage["schedule_proposal"] == 1
 
-    def test_usage_separate_periods(self):
+    def test_usage_separate_periods(self, db):
         """期間ごとの使用量分離"""
-        db = Database()
         period1_start = datetime(2026, 1, 1)
         period1_end = datetime(2026, 2, 1)
         period2_start = datetime(2026, 2, 1)
@@ -355,49 +298,125 @@ class TestUsageOperations:
 class TestAuditLogOperations:
     """監査ログ操作テスト"""
 
-    def test_log_audit(self):
-        """監査ログ記録"""
-        db = Database()
+    @pytest.mark.parametrize("action,user_id,details,ip_address", [
+        ("user_login", "audit-user", {"ip": "192.168.1.1"}, "192.168.1.1"),
+        ("system_startup", None, {"version": "1.0.0"}, None),
+        ("test_action", None, {"message": "日本語テスト", "emoji": "🎉"}, None),
+        ("no_details", "audit-user", None, None),
+    ], ids=["with_user", "without_user", "unicode_details", "without_details"])
+    def test_log_audit_variants(self, db, action, user_id, details, ip_address):
+        """監査ログの記録と取得"""
         db.log_audit(
-            action="user_login",
-            user_id="audit-user",
-            details={"ip": "192.168.1.1"},
-            ip_address="192.168.1.1"
+            action=action,
+            user_id=user_id,
+            details=details,
+            ip_address=ip_address
         )
 
-        logs = db.get_audit_logs("audit-user")
+        logs = db.get_audit_logs(user_id)
         assert len(logs) == 1
-        assert logs[0]["action"] == "user_login"
-
-    def test_log_without_user(self):
-        """ユーザーなしの監査ログ"""
-        db = Database()
-        db.log_audit(
-            action="system_startup",
-            details={"version": "1.0.0"}
-        )
+        assert logs[0]["action"] == action
+        assert logs[0]["user_id"] == user_id
+        assert logs[0]["details"] == details
+        assert logs[0]["ip_address"] == ip_address
 
-        logs = db.get_audit_logs()
-        assert len(logs) >= 1
-
-    def test_get_audit_logs_limit(self):
+    def test_get_audit_logs_limit(self, db):
         """監査ログの件数制限"""
-        db = Database()
-
-        # 10件のログを記録
-        for i in range(10):
-            db.log_audit(
-                action=f"action_{i}",
-                user_id="limit-user"
-            )
+        # 10件のログを一括記録
+        db.log_audit_many([
+            {"action": f"action_{i}", "user_id": "limit-user"} for i in range(10)
+        ])
 
         logs = db.get_audit_logs("limit-user", limit=5)
         assert len(logs) == 5
 
-    def test_audit_log_order(self):
-        """監査ログの並び順（新しい順 = ID降順）"""
+    def test_transaction_rollback_on_error(self, db):
+        """トランザクション内で例外が発生した場合はすべてロールバック"""
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.log_audit(action="first", user_id="tx-user")
+                db.log_audit(action="second", user_id="tx-user")
+                raise RuntimeError("中断")
+
+        assert db.get_audit_logs("tx-user") == []
+
+        # ロールバック後も通常のcommitが機能する
+        db.log_audit(action="after", user_id="tx-user")
+        assert len(db.get_audit_logs("tx-user")) == 1
+
+    @pytest.mark.parametrize("duplicate", ["user", "subscription"])
+    def test_transaction_after_duplicate_insert(self, db, duplicate):
+        """重複エラー後も暗黙のトランザクションが残らず、transaction()を開始できる"""
+        db.create_user(user_id="dup-tx-1", email="duptx@example.com", password_hash="hash")
+        if duplicate == "user":
+            assert db.create_user(user_id="dup-tx-2", email="duptx@example.com", password_hash="hash") is None
+        else:
+            db.create_subscription(subscription_id="sub-dup-tx", user_id="dup-tx-1", plan="free")
+            assert db.create_subscription(subscription_id="sub-dup-tx", user_id="dup-tx-1", plan="pro") is None
+
+        with db.transaction():
+            db.log_audit(action="after_duplicate", user_id="dup-tx-1")
+
+        assert len(db.get_audit_logs("dup-tx-1")) == 1
+
+    def test_nested_transaction_rolls_back_inner_only(self, db):
+        """ネストしたtransaction()は内側の変更のみロールバック"""
+        with db.transaction():
+            db.log_audit(action="outer", user_id="nested-user")
+            with pytest.raises(RuntimeError):
+                with db.transaction():
+                    db.log_audit(action="inner", user_id="nested-user")
+                    raise RuntimeError("中断")
+
+        logs = db.get_audit_logs("nested-user")
+        assert [log["action"] for log in logs] == ["outer"]
+
+    def test_transaction_not_shared_across_threads(self, ramdisk_path):
+        """transaction()の接続はブロックを開いたスレッドからのみ使われる"""
+        db = Database(str(ramdisk_path / "threads.db"))
+        db.create_user(user_id="thread-user", email="thread@example.com", password_hash="hash")
+
+        result = {}
+
+        def read_user():
+            result["user"] = db.get_user_by_id("thread-user")
+
+        with db.transaction():
+            db.log_audit(action="in_tx", user_id="thread-user")
+            worker = threading.Thread(target=read_user)
+            worker.start()
+            worker.join()
+
+        assert result["user"].email == "thread@example.com"
+
+    def test_transaction_isolated_from_other_threads_in_memory(self):
+        """インメモリDBで他スレッドの重複エラーがtransaction()の変更を巻き戻さない"""
         db = Database()
-
+        db.create_user(user_id="existing", email="shared@example.com", password_hash="hash")
+
+        finished = threading.Event()
+        result = {}
+
+        def insert_duplicate():
+            result["user"] = db.create_user(user_id="dup", email="shared@example.com", password_hash="hash")
+            finished.set()
+
+        worker = threading.Thread(target=insert_duplicate)
+        with db.transaction():
+            db.create_user(user_id="a1", email="a1@example.com", password_hash="hash")
+            worker.start()
+            # 排他されていれば他スレッドはブロック終了まで待つため、待機はタイムアウトする
+            assert not finished.wait(timeout=0.2)
+            db.create_user(user_id="a2", email="a2@example.com", password_hash="hash")
+        worker.join()
+
+        assert result["user"] is None
+        assert db.get_user_by_id("a1") is not None
+        assert db.get_user_by_id("a2") is not None
+        db.close()
+
+    def test_audit_log_order(self, db):
+        """監査ログの並び順（新しい順 = ID降順）"""
         db.log_audit(action="first", user_id="order-user")
         db.log_audit(action="second", user_id="order-user")
         db.log_audit(action="third", user_id="order-user")
@@ -415,59 +434,36 @@ class TestAuditLogOperations:
 class TestDatabasePersistence:
     """データベース永続性テスト"""
 
-    def test_persistence_across_connections(self, tmp_path):
+    def test_persistence_across_connections(self, ramdisk_path):
         """接続間のデータ永続性"""
-        db_path = str(tmp_path / "persist.db")
+        db_path = str(ramdisk_path / "persist.db")
 
         # 最初の接続でデータ作成
-        db1 = Database(db_path)
+        db1 = Database(db_path, tuning="fast")
         db1.create_user(
             user_id="persist-user",
             email="persist@example.com",
             password_hash="hash"
         )
 
-        # 新しい接続でデータ確認
-        db2 = Database(db_path)
-        user = db2.get_user_by_id("persist-user")
+        # 新しい接続でデータ確認（スキーマ初期化を伴うDatabaseは作らず直接読む）
+        # ファイルDBは呼び出し毎に接続を閉じるため、WALの内容はこの時点でチェックポイント済み
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute(
+                "SELECT email FROM users WHERE id = ?", ("persist-user",)
+            ).fetchone()
+        finally:
+            conn.close()
 
-        assert user is not None
-        assert user.email == "persist@example.com"
+        assert row == ("persist@example.com",)
 
 
 class TestEdgeCases:
     """エッジケーステスト"""
 
-    def test_special_characters_in_name(self):
-        """名前に特殊文字"""
-        db = Database()
-        user = db.create_user(
-            user_id="special-user",
-            email="special@example.com",
-            password_hash="hash",
-            name="O'Brien \"Test\" <User>"
-        )
-
-        assert user.name == "O'Brien \"Test\" <User>"
-
-        fetched = db.get_user_by_id("special-user")
-        assert fetched.name == "O'Brien \"Test\" <User>"
-
-    def test_unicode_in_details(self):
-        """詳細に日本語"""
-        db = Database()
-        db.log_audit(
-            action="test_action",
-            details={"message": "日本語テスト", "emoji": "🎉"}
-        )
-
-        logs = db.get_audit_logs()
-        assert logs[0]["details"]["message"] == "日本語テスト"
-        assert logs[0]["details"]["emoji"] == "🎉"
-
-    def test_empty_update(self):
+    def test_empty_update(self, db):
         """空の更新"""
-        db = Database()
         db.create_user(
             user_id="empty-upd-user",
             email="emptyupd@example.com",
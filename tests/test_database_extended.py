@@ -11,10 +11,11 @@ database.pyカバレッジ向上テスト
 - 569-608: __main__ブロック（テスト対象外）
 """
 
+import logging
+import math
 import pytest
-import sqlite3
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
 
 from src.database import (
     Database,
@@ -23,19 +24,27 @@ from src.database import (
     DBUsageRecord,
     create_database,
     _str_to_datetime,
-    _datetime_to_str,
 )
 
 
+# データクラスのテストで使う日時
+_CREATED_AT = datetime(2026, 1, 1, 9, 0, 0)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch, frozen_clock):
+    """src.databaseの現在時刻をfixed_nowに固定"""
+    return frozen_clock(monkeypatch, "src.database")
+
+
 class TestStrToDatetime:
     """_str_to_datetime関数のテスト"""
 
-    def test_none_input_returns_current_datetime(self) -> None:
-        """Noneが渡された場合、現在時刻を返す"""
-        result = _str_to_datetime(None)
-        # 現在時刻に近いかチェック
-        now = datetime.now()
-        assert abs((result - now).total_seconds()) < 5
+    @pytest.mark.parametrize("value", [None, "invalid-date-string", ""],
+                             ids=["none", "invalid_string", "empty_string"])
+    def test_fallback_returns_current_datetime(self, frozen_now, value) -> None:
+        """None・無効な文字列・空文字列の場合、現在時刻を返す"""
+        assert _str_to_datetime(value) == frozen_now
 
     def test_valid_iso8601_string(self) -> None:
         """有効なISO8601文字列を変換"""
@@ -47,18 +56,6 @@ class TestStrToDatetime:
         assert result.hour == 10
         assert result.minute == 30
 
-    def test_invalid_string_returns_current_datetime(self) -> None:
-        """無効な文字列の場合、現在時刻を返す"""
-        result = _str_to_datetime("invalid-date-string")
-        now = datetime.now()
-        assert abs((result - now).total_seconds()) < 5
-
-    def test_empty_string_returns_current_datetime(self) -> None:
-        """空文字列の場合、現在時刻を返す"""
-        result = _str_to_datetime("")
-        now = datetime.now()
-        assert abs((result - now).total_seconds()) < 5
-
 
 class TestDatabaseClose:
     """Database.close()メソッドのテスト"""
@@ -82,23 +79,25 @@ class TestDatabaseClose:
         db.close()
         assert db._persistent_conn is None
 
-    def test_close_logs_debug_message(self) -> None:
+    def test_close_logs_debug_message(self, caplog) -> None:
         """close()がデバッグメッセージをログ出力することを確認"""
         db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
-        with patch('src.database.logger') as mock_logger:
+        with caplog.at_level(logging.DEBUG, logger="src.database"):
             db.close()
-            # debugメソッドが呼ばれたことを確認
-            mock_logger.debug.assert_called()
+        # debugログが出力されたことを確認
+        assert any(
+            r.levelno == logging.DEBUG and "クローズ" in r.getMessage()
+            for r in caplog.records
+        )
 
 
 class TestDatabaseCreateSubscriptionIntegrityError:
     """create_subscriptionのIntegrityErrorテスト"""
 
-    def test_create_subscription_duplicate_id(self) -> None:
+    def test_create_subscription_duplicate_id(self, db) -> None:
         """同一IDでのサブスクリプション作成がNoneを返す"""
-        db = Database(":memory:")
         # ユーザー作成
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
@@ -111,28 +110,26 @@ class TestDatabaseCreateSubscriptionIntegrityError:
         # IntegrityErrorにより None が返る
         assert sub2 is None
 
-    def test_create_subscription_integrity_error_logging(self) -> None:
+    def test_create_subscription_integrity_error_logging(self, db, caplog) -> None:
         """IntegrityError時にwarningログが出力される"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
         db.create_subscription("sub1", "user1", "personal")
 
-        with patch('src.database.logger') as mock_logger:
+        with caplog.at_level(logging.WARNING, logger="src.database"):
             db.create_subscription("sub1", "user1", "pro")
-            mock_logger.warning.assert_called()
+        assert any(r.levelno == logging.WARNING for r in caplog.records)
 
 
 class TestDatabaseUpdateSubscription:
     """update_subscriptionの追加テスト"""
 
-    def test_update_subscription_with_period_end(self) -> None:
+    def test_update_subscription_with_period_end(self, db, fixed_now) -> None:
         """period_end更新のテスト"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
         sub = db.create_subscription("sub1", "user1", "personal")
         assert sub is not None
 
-        new_end = datetime.now() + timedelta(days=60)
+        new_end = fixed_now + timedelta(days=60)
         result = db.update_subscription("sub1", period_end=new_end)
         assert result is True
 
@@ -142,9 +139,8 @@ class TestDatabaseUpdateSubscription:
         # 日付が更新されている（タイムゾーンなし比較）
         assert updated.current_period_end.date() == new_end.date()
 
-    def test_update_subscription_empty_updates(self) -> None:
+    def test_update_subscription_empty_updates(self, db) -> None:
         """更新項目がない場合Falseを返す"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
         db.create_subscription("sub1", "user1", "personal")
 
@@ -152,13 +148,12 @@ class TestDatabaseUpdateSubscription:
         result = db.update_subscription("sub1")
         assert result is False
 
-    def test_update_subscription_multiple_fields(self) -> None:
+    def test_update_subscription_multiple_fields(self, db, fixed_now) -> None:
         """複数フィールドの同時更新"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
         db.create_subscription("sub1", "user1", "personal")
 
-        new_end = datetime.now() + timedelta(days=90)
+        new_end = fixed_now + timedelta(days=90)
         result = db.update_subscription(
             "sub1",
             plan="pro",
@@ -172,9 +167,8 @@ class TestDatabaseUpdateSubscription:
         assert updated.plan == "pro"
         assert updated.status == "active"
 
-    def test_update_nonexistent_subscription(self) -> None:
+    def test_update_nonexistent_subscription(self, db) -> None:
         """存在しないサブスクリプションの更新"""
-        db = Database(":memory:")
         result = db.update_subscription("nonexistent", plan="pro")
         assert result is False
 
@@ -182,22 +176,19 @@ class TestDatabaseUpdateSubscription:
 class TestDatabaseEdgeCases:
     """その他のエッジケーステスト"""
 
-    def test_get_user_by_id_not_found(self) -> None:
+    def test_get_user_by_id_not_found(self, db) -> None:
         """存在しないユーザーIDでの取得"""
-        db = Database(":memory:")
         result = db.get_user_by_id("nonexistent")
         assert result is None
 
-    def test_get_subscription_by_user_not_found(self) -> None:
+    def test_get_subscription_by_user_not_found(self, db) -> None:
         """サブスクリプションがないユーザーでの取得"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
         result = db.get_subscription_by_user("user1")
         assert result is None
 
-    def test_create_user_duplicate_email(self) -> None:
+    def test_create_user_duplicate_email(self, db) -> None:
         """同一メールアドレスでのユーザー作成"""
-        db = Database(":memory:")
         user1 = db.create_user("user1", "test@example.com", "hash", "User 1")
         assert user1 is not None
 
@@ -205,9 +196,8 @@ class TestDatabaseEdgeCases:
         # IntegrityErrorによりNone
         assert user2 is None
 
-    def test_update_user_plan(self) -> None:
+    def test_update_user_plan(self, db) -> None:
         """ユーザープラン更新"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
         result = db.update_user("user1", plan="pro")
@@ -217,23 +207,18 @@ class TestDatabaseEdgeCases:
         assert user is not None
         assert user.plan == "pro"
 
-    def test_get_usage_no_records(self) -> None:
+    def test_get_usage_no_records(self, db, usage_period) -> None:
         """使用量レコードがない場合"""
-        db = Database(":memory:")
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
+        period_start, _ = usage_period
 
         count = db.get_usage("nonexistent", "email_summary", period_start)
         assert count == 0
 
-    def test_record_usage_multiple_operations(self) -> None:
+    def test_record_usage_multiple_operations(self, db, usage_period) -> None:
         """複数の操作タイプで使用量記録"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = datetime(now.year, now.month + 1 if now.month < 12 else 1, 1)
+        period_start, period_end = usage_period
 
         count1 = db.record_usage("user1", "email_summary", period_start, period_end)
         count2 = db.record_usage("user1", "schedule_proposal", period_start, period_end)
@@ -243,15 +228,13 @@ class TestDatabaseEdgeCases:
         assert count2 == 1
         assert count3 == 2  # email_summaryは2回目
 
-    def test_get_audit_logs_empty(self) -> None:
+    def test_get_audit_logs_empty(self, db) -> None:
         """監査ログが空の場合"""
-        db = Database(":memory:")
         logs = db.get_audit_logs("nonexistent")
         assert logs == []
 
-    def test_log_audit_with_metadata(self) -> None:
+    def test_log_audit_with_metadata(self, db) -> None:
         """メタデータ付き監査ログ記録"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
         db.log_audit(
@@ -265,70 +248,84 @@ class TestDatabaseEdgeCases:
         assert logs[0]["action"] == "user_login"
         assert "ip" in logs[0]["details"]
 
-    def test_get_audit_logs_with_limit(self) -> None:
+    def test_log_audit_details_roundtrip(self, db) -> None:
+        """detailsが同じ値で復元される（非文字列キーは文字列化）"""
+        details = {"message": "日本語", 1: "int key", "nested": {"big": 2 ** 70}}
+
+        db.log_audit("roundtrip", user_id="user1", details=details)
+
+        logs = db.get_audit_logs("user1")
+        assert logs[0]["details"] == {"message": "日本語", "1": "int key", "nested": {"big": 2 ** 70}}
+
+    def test_log_audit_details_nan_roundtrip(self, db) -> None:
+        """NaNはnullにならずNaNのまま復元される"""
+        db.log_audit("nan", user_id="user1", details={"value": float("nan")})
+
+        logs = db.get_audit_logs("user1")
+        assert math.isnan(logs[0]["details"]["value"])
+
+    def test_log_audit_details_datetime_rejected(self, db) -> None:
+        """JSON非対応の値（datetime）はTypeErrorとなり記録されない"""
+        with pytest.raises(TypeError):
+            db.log_audit("datetime", user_id="user1", details={"at": datetime(2026, 1, 1)})
+
+        assert db.get_audit_logs("user1") == []
+
+    def test_get_audit_logs_with_limit(self, db) -> None:
         """監査ログの件数制限"""
-        db = Database(":memory:")
         db.create_user("user1", "test@example.com", "hash", "Test User")
 
-        # 複数のログを記録
-        for i in range(10):
-            db.log_audit(f"action_{i}", user_id="user1", details={"index": i})
+        # 複数のログを一括記録
+        db.log_audit_many([
+            {"action": f"action_{i}", "user_id": "user1", "details": {"index": i}}
+            for i in range(10)
+        ])
 
         logs = db.get_audit_logs("user1", limit=5)
         assert len(logs) == 5
+        # 新しい順に取得される
+        assert [log["details"]["index"] for log in logs] == [9, 8, 7, 6, 5]
 
 
 class TestDatabaseDataclasses:
     """データクラスのテスト"""
 
-    def test_db_user_attributes(self) -> None:
-        """DBUserのアトリビュート確認"""
-        user = DBUser(
-            id="user1",
-            email="test@example.com",
-            password_hash="hash",
-            name="Test User",
-            plan="personal",
-            stripe_customer_id=None,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        assert user.id == "user1"
-        assert user.email == "test@example.com"
-        assert user.name == "Test User"
-        assert user.plan == "personal"
-
-    def test_db_subscription_attributes(self) -> None:
-        """DBSubscriptionのアトリビュート確認"""
-        now = datetime.now()
-        sub = DBSubscription(
-            id="sub1",
-            user_id="user1",
-            plan="pro",
-            status="active",
-            stripe_subscription_id="stripe_123",
-            current_period_start=now,
-            current_period_end=now + timedelta(days=30),
-            created_at=now,
-            updated_at=now
-        )
-        assert sub.id == "sub1"
-        assert sub.plan == "pro"
-        assert sub.status == "active"
-
-    def test_db_usage_record_attributes(self) -> None:
-        """DBUsageRecordのアトリビュート確認"""
-        now = datetime.now()
-        record = DBUsageRecord(
-            id="usage1",
-            user_id="user1",
-            feature="email_summary",
-            count=5,
-            period_start=now,
-            period_end=now + timedelta(days=30),
-        )
-        assert record.feature == "email_summary"
-        assert record.count == 5
+    @pytest.mark.parametrize("cls,kwargs,checks", [
+        (
+            DBUser,
+            {
+                "id": "user1", "email": "test@example.com", "password_hash": "hash",
+                "name": "Test User", "plan": "personal", "stripe_customer_id": None,
+                "created_at": _CREATED_AT, "updated_at": _CREATED_AT,
+            },
+            {"id": "user1", "email": "test@example.com", "name": "Test User", "plan": "personal"},
+        ),
+        (
+            DBSubscription,
+            {
+                "id": "sub1", "user_id": "user1", "plan": "pro", "status": "active",
+                "stripe_subscription_id": "stripe_123",
+                "current_period_start": _CREATED_AT, "current_period_end": _CREATED_AT + timedelta(days=30),
+                "created_at": _CREATED_AT, "updated_at": _CREATED_AT,
+            },
+            {"id": "sub1", "plan": "pro", "status": "active"},
+        ),
+        (
+            DBUsageRecord,
+            {
+                "id": "usage1", "user_id": "user1", "feature": "email_summary", "count": 5,
+                "period_start": _CREATED_AT, "period_end": _CREATED_AT + timedelta(days=30),
+            },
+            {"feature": "email_summary", "count": 5},
+        ),
+    ], ids=["DBUser", "DBSubscription", "DBUsageRecord"])
+    def test_dataclass_attributes(self, cls, kwargs, checks) -> None:
+        """各データクラスのアトリビュート確認（不変・__slots__付き）"""
+        obj = cls(**kwargs)
+        assert {key: getattr(obj, key) for key in checks} == checks
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            obj.id = "changed"
 
 
 class TestCreateDatabaseFunction:
@@ -341,9 +338,9 @@ class TestCreateDatabaseFunction:
         assert isinstance(db, Database)
         db.close()
 
-    def test_create_database_custom_path(self, tmp_path) -> None:
+    def test_create_database_custom_path(self, ramdisk_path) -> None:
         """カスタムパスでのDatabase作成"""
-        db_path = str(tmp_path / "test.db")
+        db_path = str(ramdisk_path / "test.db")
         db = create_database(db_path)
         assert db is not None
         db.close()
@@ -352,10 +349,8 @@ class TestCreateDatabaseFunction:
 class TestDatabaseIntegration:
     """統合テスト"""
 
-    def test_full_user_lifecycle(self) -> None:
+    def test_full_user_lifecycle(self, db, usage_period) -> None:
         """ユーザーの完全なライフサイクル"""
-        db = Database(":memory:")
-
         # 1. ユーザー作成
         user = db.create_user("user1", "test@example.com", "hash", "Test User")
         assert user is not None
@@ -365,12 +360,11 @@ class TestDatabaseIntegration:
         assert sub is not None
 
         # 3. 使用量記録
-        now = datetime.now()
-        period_start = datetime(now.year, now.month, 1)
-        period_end = datetime(now.year, now.month + 1 if now.month < 12 else 1, 1)
+        period_start, period_end = usage_period
 
-        for _ in range(5):
-            db.record_usage("user1", "email_summary", period_start, period_end)
+        with db.transaction():
+            for _ in range(5):
+                db.record_usage("user1", "email_summary", period_start, period_end)
 
         count = db.get_usage("user1", "email_summary", period_start)
         assert count == 5
@@ -390,21 +384,31 @@ class TestDatabaseIntegration:
         logs = db.get_audit_logs("user1")
         assert len(logs) == 1
 
-        db.close()
-
-    def test_multiple_users(self) -> None:
+    def test_multiple_users(self, db) -> None:
         """複数ユーザーのテスト"""
-        db = Database(":memory:")
-
-        # 複数ユーザー作成
-        for i in range(3):
-            db.create_user(f"user{i}", f"user{i}@example.com", "hash", f"User {i}")
-            db.create_subscription(f"sub{i}", f"user{i}", "personal")
+        # 複数ユーザーを一括作成
+        assert db.create_users_bulk([
+            (f"user{i}", f"user{i}@example.com", "hash", f"User {i}") for i in range(3)
+        ]) == 3
+        assert db.create_subscriptions_bulk([
+            (f"sub{i}", f"user{i}", "personal") for i in range(3)
+        ]) == 3
 
         # 各ユーザーの取得確認
         for i in range(3):
             user = db.get_user_by_email(f"user{i}@example.com")
             assert user is not None
             assert user.id == f"user{i}"
+        assert db.get_subscription_by_user("user2").plan == "personal"
 
-        db.close()
+    def test_bulk_create_rolls_back_on_duplicate(self, db) -> None:
+        """一括作成で重複がある場合は全件ロールバック"""
+        db.create_user("user1", "dup@example.com", "hash")
+
+        created = db.create_users_bulk([
+            ("user2", "new@example.com", "hash", None),
+            ("user3", "dup@example.com", "hash", None),
+        ])
+
+        assert created == 0
+        assert db.get_user_by_id("user2") is None
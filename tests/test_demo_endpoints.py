@@ -4,38 +4,82 @@
 API認証情報がなくてもサービスの機能を体験できるエンドポイントのテスト
 """
 
-import pytest
+import json
 import os
 
-# テスト用DB設定
-os.environ.setdefault("DATABASE_PATH", ":memory:")
+import pytest
 
 try:
-    from fastapi.testclient import TestClient
-    from src.api import create_app, FASTAPI_AVAILABLE
-    TESTCLIENT_AVAILABLE = FASTAPI_AVAILABLE
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TESTCLIENT_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# テスト用DB設定
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+# FastAPIが利用できない場合はモジュールごとスキップ（判定はimport時に1回だけ）
+TestClient = pytest.importorskip("fastapi.testclient").TestClient
+from src.api import create_app, FASTAPI_AVAILABLE  # noqa: E402
 
+if not FASTAPI_AVAILABLE:
+    pytest.skip("FastAPIが利用できません", allow_module_level=True)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def test_client():
-    """FastAPI TestClientフィクスチャ"""
-    if not TESTCLIENT_AVAILABLE:
-        pytest.skip("FastAPIが利用できません")
+    """
+    FastAPI TestClientフィクスチャ（モジュール内で共有）
+
+    デモエンドポイントは状態を持たない読み取り専用のため、アプリ生成は1回だけ行う。
+    """
     app = create_app()
     return TestClient(app)
 
 
+def _json(response):
+    """レスポンスボディをデコード（orjsonがあれば使用し、なければ標準ライブラリ）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+DEMO_ENDPOINTS = ("/demo/emails", "/demo/schedule", "/demo/features")
+VALID_PRIORITIES = frozenset(("high", "medium", "low"))
+
+
+@pytest.fixture(scope="module")
+def demo_responses(test_client):
+    """各デモエンドポイントのレスポンス（GETは1回だけ行いモジュール内で共有）"""
+    return {endpoint: test_client.get(endpoint) for endpoint in DEMO_ENDPOINTS}
+
+
+@pytest.fixture(scope="module")
+def demo_emails(demo_responses):
+    """/demo/emails のJSON"""
+    return _json(demo_responses["/demo/emails"])
+
+
+@pytest.fixture(scope="module")
+def demo_schedule(demo_responses):
+    """/demo/schedule のJSON"""
+    return _json(demo_responses["/demo/schedule"])
+
+
+@pytest.fixture(scope="module")
+def demo_features(demo_responses):
+    """/demo/features のJSON"""
+    return _json(demo_responses["/demo/features"])
+
+
 class TestDemoEmailEndpoint:
     """デモメール要約エンドポイントのテスト"""
 
-    def test_demo_emails_returns_sample_data(self, test_client):
+    def test_demo_emails_returns_sample_data(self, demo_responses, demo_emails):
         """デモエンドポイントがサンプルデータを返すこと"""
-        response = test_client.get("/demo/emails")
-        assert response.status_code == 200
+        assert demo_responses["/demo/emails"].status_code == 200
 
-        data = response.json()
+        data = demo_emails
         assert "summaries" in data
         assert "count" in data
         assert "demo_mode" in data
@@ -45,16 +89,14 @@ class TestDemoEmailEndpoint:
         assert data["count"] == len(data["summaries"])
         assert data["count"] > 0
 
-    def test_demo_emails_no_auth_required(self, test_client):
+    def test_demo_emails_no_auth_required(self, demo_responses):
         """認証なしでアクセスできること"""
-        # 認証ヘッダーなしでリクエスト
-        response = test_client.get("/demo/emails")
-        assert response.status_code == 200
+        # demo_responsesは認証ヘッダーなしで取得している
+        assert demo_responses["/demo/emails"].status_code == 200
 
-    def test_demo_emails_structure(self, test_client):
+    def test_demo_emails_structure(self, demo_emails):
         """メール要約の構造が正しいこと"""
-        response = test_client.get("/demo/emails")
-        data = response.json()
+        data = demo_emails
 
         for summary in data["summaries"]:
             assert "id" in summary
@@ -63,25 +105,22 @@ class TestDemoEmailEndpoint:
             assert "summary" in summary
             assert "priority" in summary
 
-    def test_demo_emails_priority_values(self, test_client):
+    def test_demo_emails_priority_values(self, demo_emails):
         """優先度が有効な値であること"""
-        response = test_client.get("/demo/emails")
-        data = response.json()
+        data = demo_emails
 
-        valid_priorities = {"high", "medium", "low"}
         for summary in data["summaries"]:
-            assert summary["priority"] in valid_priorities
+            assert summary["priority"] in VALID_PRIORITIES
 
 
 class TestDemoScheduleEndpoint:
     """デモスケジュール提案エンドポイントのテスト"""
 
-    def test_demo_schedule_returns_proposals(self, test_client):
+    def test_demo_schedule_returns_proposals(self, demo_responses, demo_schedule):
         """デモエンドポイントが提案を返すこと"""
-        response = test_client.get("/demo/schedule")
-        assert response.status_code == 200
+        assert demo_responses["/demo/schedule"].status_code == 200
 
-        data = response.json()
+        data = demo_schedule
         assert "proposals" in data
         assert "count" in data
         assert "demo_mode" in data
@@ -90,15 +129,13 @@ class TestDemoScheduleEndpoint:
         assert data["demo_mode"] is True
         assert data["count"] == len(data["proposals"])
 
-    def test_demo_schedule_no_auth_required(self, test_client):
+    def test_demo_schedule_no_auth_required(self, demo_responses):
         """認証なしでアクセスできること"""
-        response = test_client.get("/demo/schedule")
-        assert response.status_code == 200
+        assert demo_responses["/demo/schedule"].status_code == 200
 
-    def test_demo_schedule_structure(self, test_client):
+    def test_demo_schedule_structure(self, demo_schedule):
         """スケジュール提案の構造が正しいこと"""
-        response = test_client.get("/demo/schedule")
-        data = response.json()
+        data = demo_schedule
 
         for proposal in data["proposals"]:
             assert "id" in proposal
@@ -108,10 +145,9 @@ class TestDemoScheduleEndpoint:
             assert "score" in proposal
             assert "reason" in proposal
 
-    def test_demo_schedule_scores_valid_range(self, test_client):
+    def test_demo_schedule_scores_valid_range(self, demo_schedule):
         """スコアが有効な範囲内であること"""
-        response = test_client.get("/demo/schedule")
-        data = response.json()
+        data = demo_schedule
 
         for proposal in data["proposals"]:
             score = proposal["score"]
@@ -121,49 +157,44 @@ class TestDemoScheduleEndpoint:
 class TestDemoFeaturesEndpoint:
     """デモ機能一覧エンドポイントのテスト"""
 
-    def test_demo_features_returns_list(self, test_client):
+    def test_demo_features_returns_list(self, demo_responses, demo_features):
         """機能一覧を返すこと"""
-        response = test_client.get("/demo/features")
-        assert response.status_code == 200
+        assert demo_responses["/demo/features"].status_code == 200
 
-        data = response.json()
+        data = demo_features
         assert "features" in data
         assert "pricing" in data
         assert "demo_mode" in data
         assert data["demo_mode"] is True
 
-    def test_demo_features_structure(self, test_client):
+    def test_demo_features_structure(self, demo_features):
         """機能の構造が正しいこと"""
-        response = test_client.get("/demo/features")
-        data = response.json()
+        data = demo_features
 
         for feature in data["features"]:
             assert "id" in feature
             assert "name" in feature
             assert "description" in feature
 
-    def test_demo_pricing_in_jpy(self, test_client):
+    def test_demo_pricing_in_jpy(self, demo_features):
         """価格が日本円であること"""
-        response = test_client.get("/demo/features")
-        data = response.json()
+        data = demo_features
 
         for plan_name, plan_info in data["pricing"].items():
             assert plan_info["currency"] == "JPY"
             assert isinstance(plan_info["price"], (int, float))
 
-    def test_demo_pricing_plans_exist(self, test_client):
+    def test_demo_pricing_plans_exist(self, demo_features):
         """全プランが存在すること"""
-        response = test_client.get("/demo/features")
-        data = response.json()
+        data = demo_features
 
         assert "free" in data["pricing"]
         assert "personal" in data["pricing"]
         assert "pro" in data["pricing"]
 
-    def test_demo_pricing_limits_exist(self, test_client):
+    def test_demo_pricing_limits_exist(self, demo_features):
         """各プランに制限が設定されていること"""
-        response = test_client.get("/demo/features")
-        data = response.json()
+        data = demo_features
 
         for plan_name, plan_info in data["pricing"].items():
             assert "email_limit" in plan_info
@@ -173,27 +204,18 @@ class TestDemoFeaturesEndpoint:
 class TestDemoEndpointsIntegration:
     """デモエンドポイント統合テスト"""
 
-    def test_all_demo_endpoints_accessible(self, test_client):
-        """全デモエンドポイントにアクセスできること"""
-        endpoints = ["/demo/emails", "/demo/schedule", "/demo/features"]
-
-        for endpoint in endpoints:
-            response = test_client.get(endpoint)
-            assert response.status_code == 200, f"{endpoint} failed"
-
-    def test_demo_mode_flag_consistent(self, test_client):
-        """全エンドポイントでdemo_modeフラグがTrueであること"""
-        endpoints = ["/demo/emails", "/demo/schedule", "/demo/features"]
-
-        for endpoint in endpoints:
-            response = test_client.get(endpoint)
-            data = response.json()
-            assert data.get("demo_mode") is True, f"{endpoint} demo_mode is not True"
+    @pytest.mark.parametrize("endpoint", DEMO_ENDPOINTS)
+    def test_demo_endpoint_accessible_in_demo_mode(self, demo_responses, endpoint):
+        """全デモエンドポイントにアクセスでき、demo_modeフラグがTrueであること"""
+        response = demo_responses[endpoint]
+        assert response.status_code == 200
+        assert _json(response).get("demo_mode") is True
 
-    def test_demo_endpoints_cors_headers(self, test_client):
+    @pytest.mark.parametrize("endpoint", DEMO_ENDPOINTS)
+    def test_demo_endpoints_cors_headers(self, test_client, endpoint):
         """CORSヘッダーが設定されていること"""
         response = test_client.options(
-            "/demo/emails",
+            endpoint,
             headers={
                 "Origin": "http://localhost:3000",
                 "Access-Control-Request-Method": "GET"
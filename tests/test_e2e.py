@@ -4,25 +4,67 @@ E2Eテストシナリオ - エンドツーエンド統合テスト
 完全なユーザーフローをシミュレートしてシステム全体の動作を検証
 """
 
+import json
 import pytest
-import tempfile
-import os
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 from src.coordinator import Coordinator, CommandResult
-from src.billing import BillingService, SubscriptionPlan, MockBillingService
-from src.database import Database, create_database
+from src.billing import BillingService, SubscriptionPlan, MockBillingService, PlanLimits
 from src.llm import create_llm_service
 
 
+@pytest.fixture(scope="session")
+def mock_llm():
+    """モックLLMサービス（状態を持たないためセッションで1回だけ生成）"""
+    return create_llm_service(use_mock=True)
+
+
+@pytest.fixture(scope="module")
+def _shared_mock_coordinator(mock_llm):
+    """モックLLMを使うCoordinator（モジュール内で1回だけ生成）"""
+    return Coordinator(llm_service=mock_llm)
+
+
+@pytest.fixture
+def mock_coordinator(_shared_mock_coordinator):
+    """共有Coordinatorを返し、テスト後に保留アクションをクリア"""
+    yield _shared_mock_coordinator
+    _shared_mock_coordinator._pending_actions.clear()
+
+
+@pytest.fixture
+def billing():
+    """テスト毎に独立したモック課金サービス"""
+    return MockBillingService()
+
+
+@pytest.fixture
+def saturated_free_user(db, billing):
+    """無料プランのメール要約枠を使い切ったユーザー（DB登録・サブスクリプション作成済み）"""
+    user = db.create_user(
+        user_id="saturated-user",
+        email="saturated@example.com",
+        password_hash="hash"
+    )
+    billing.create_subscription(
+        user_id=user.id,
+        customer_id=f"cus_{user.id}",
+        plan=SubscriptionPlan.FREE
+    )
+    limit = PlanLimits.for_plan(SubscriptionPlan.FREE).email_summaries_per_month
+    billing.set_usage(user.id, "email_summary", limit)
+    return user
+
+
 class TestE2EUserRegistrationFlow:
     """E2E: ユーザー登録から利用開始までのフロー"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.db = create_database()  # インメモリDB
-        self.billing = MockBillingService()
+    @pytest.fixture(autouse=True)
+    def _setup(self, db, billing):
+        """テストセットアップ（スキーマ初期化済みのセッション共有DBを使用）"""
+        self.db = db
+        self.billing = billing
 
     def test_new_user_registration_and_free_plan(self):
         """新規ユーザー登録と無料プラン利用"""
@@ -50,36 +92,19 @@ class TestE2EUserRegistrationFlow:
         can_use, msg = self.billing.check_usage_limit(user.id, "email_summary")
         assert can_use is True
 
-        # 4. 使用量記録
-        for i in range(50):  # 無料上限まで使用
-            result = self.billing.record_usage(user.id, "email_summary")
-            assert result is True
+        # 4. 使用量記録（上限の1回手前までは直接設定し、最後の1回を記録）
+        self.billing.set_usage(user.id, "email_summary", 49)
+        assert self.billing.record_usage(user.id, "email_summary") is True
 
         # 5. 上限到達後は使用不可
         can_use, msg = self.billing.check_usage_limit(user.id, "email_summary")
         assert can_use is False
         assert "上限" in msg
 
-    def test_user_upgrade_flow(self):
+    def test_user_upgrade_flow(self, saturated_free_user):
         """無料プランからProプランへのアップグレードフロー"""
-        # 1. 無料ユーザー作成
-        user = self.db.create_user(
-            user_id="e2e-upgrade-user",
-            email="upgrade@example.com",
-            password_hash="hash123",
-            name="Upgrade User"
-        )
-
-        # 2. 無料サブスクリプション
-        self.billing.create_subscription(
-            user_id=user.id,
-            customer_id=f"cus_{user.id}",
-            plan=SubscriptionPlan.FREE
-        )
-
-        # 3. 無料枠を使い切る
-        for _ in range(50):
-            self.billing.record_usage(user.id, "email_summary")
+        # 1-3. 無料枠を使い切った無料ユーザー
+        user = saturated_free_user
 
         can_use, _ = self.billing.check_usage_limit(user.id, "email_summary")
         assert can_use is False
@@ -101,10 +126,10 @@ class TestE2EUserRegistrationFlow:
 class TestE2EEmailWorkflow:
     """E2E: メール処理ワークフロー"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.llm = create_llm_service(use_mock=True)
-        self.coordinator = Coordinator(llm_service=self.llm)
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_coordinator):
+        """テストセットアップ（モジュール共有のCoordinatorを使用）"""
+        self.coordinator = mock_coordinator
 
     def test_inbox_summary_flow(self):
         """受信トレイ要約フロー"""
@@ -135,10 +160,10 @@ class TestE2EEmailWorkflow:
 class TestE2ESchedulingWorkflow:
     """E2E: スケジュール管理ワークフロー"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.llm = create_llm_service(use_mock=True)
-        self.coordinator = Coordinator(llm_service=self.llm)
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_coordinator):
+        """テストセットアップ（モジュール共有のCoordinatorを使用）"""
+        self.coordinator = mock_coordinator
 
     def test_schedule_meeting_flow(self):
         """会議スケジュールフロー"""
@@ -165,9 +190,10 @@ class TestE2ESchedulingWorkflow:
 class TestE2EConfirmationFlow:
     """E2E: 確認フロー"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.coordinator = Coordinator()
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_llm):
+        """テストセットアップ（共有モックLLMを注入）"""
+        self.coordinator = Coordinator(llm_service=mock_llm)
 
     def test_confirm_without_pending_action(self):
         """保留アクションなしでconfirm"""
@@ -185,23 +211,18 @@ class TestE2EConfirmationFlow:
 class TestE2EAuditFlow:
     """E2E: 監査ログフロー"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.audit_path = os.path.join(self.temp_dir, "audit.json")
-        self.coordinator = Coordinator(audit_log_path=self.audit_path)
-
-    def test_audit_log_on_actions(self):
+    def test_audit_log_on_actions(self, tmp_path, mock_llm):
         """アクション実行時の監査ログ"""
+        audit_path = tmp_path / "audit.json"
+        coordinator = Coordinator(llm_service=mock_llm, audit_log_path=str(audit_path))
+
         # 1. アクション実行
-        self.coordinator.process_command("inbox")
-        self.coordinator.process_command("status")
-
-        # 2. 監査ログ確認
-        import json
-        if os.path.exists(self.audit_path):
-            with open(self.audit_path, 'r') as f:
-                logs = json.load(f)
+        coordinator.process_command("inbox")
+        coordinator.process_command("status")
+
+        # 2. 監査ログ確認（ログが書かれた場合のみ読み込む）
+        if audit_path.exists():
+            logs = json.loads(audit_path.read_bytes())
             assert len(logs) >= 2
             assert any("summarize_inbox" in log.get("action_type", "") for log in logs)
 
@@ -209,10 +230,8 @@ class TestE2EAuditFlow:
 class TestE2EDatabasePersistence:
     """E2E: データベース永続化フロー"""
 
-    def test_user_lifecycle(self):
+    def test_user_lifecycle(self, db):
         """ユーザーライフサイクル全体"""
-        db = create_database()
-
         # 1. 作成
         user = db.create_user(
             user_id="lifecycle-user",
@@ -296,17 +315,15 @@ class TestE2EBillingIntegration:
 class TestE2EErrorHandling:
     """E2E: エラーハンドリング"""
 
-    def test_unknown_command(self):
+    def test_unknown_command(self, mock_llm):
         """不明なコマンド"""
-        coordinator = Coordinator()
+        coordinator = Coordinator(llm_service=mock_llm)
         result = coordinator.process_command("unknown_command_xyz")
         assert result.success is False
         assert "不明" in result.message or "help" in result.message
 
-    def test_duplicate_user_registration(self):
+    def test_duplicate_user_registration(self, db):
         """重複ユーザー登録"""
-        db = create_database()
-
         # 1回目: 成功
         user1 = db.create_user(
             user_id="dup-user-1",
@@ -327,24 +344,16 @@ class TestE2EErrorHandling:
 class TestE2EMultiUserScenario:
     """E2E: マルチユーザーシナリオ"""
 
-    def setup_method(self):
-        """テストセットアップ"""
-        self.db = create_database()
-        self.billing = MockBillingService()
+    @pytest.fixture(autouse=True)
+    def _setup(self, db, billing):
+        """テストセットアップ（スキーマ初期化済みのセッション共有DBを使用）"""
+        self.db = db
+        self.billing = billing
 
-    def test_multiple_users_independent(self):
+    def test_multiple_users_independent(self, saturated_free_user):
         """複数ユーザーの独立性"""
-        # ユーザー1: 無料プラン
-        user1 = self.db.create_user(
-            user_id="multi-user-1",
-            email="user1@example.com",
-            password_hash="hash1"
-        )
-        self.billing.create_subscription(
-            user_id=user1.id,
-            customer_id=f"cus_{user1.id}",
-            plan=SubscriptionPlan.FREE
-        )
+        # ユーザー1: 無料枠を使い切った無料プラン
+        user1 = saturated_free_user
 
         # ユーザー2: Proプラン
         user2 = self.db.create_user(
@@ -358,10 +367,6 @@ class TestE2EMultiUserScenario:
             plan=SubscriptionPlan.PRO
         )
 
-        # ユーザー1の使用量を消費
-        for _ in range(50):
-            self.billing.record_usage(user1.id, "email_summary")
-
         # ユーザー1は上限到達
         can_use1, _ = self.billing.check_usage_limit(user1.id, "email_summary")
         assert can_use1 is False
@@ -381,8 +386,9 @@ class TestE2EMultiUserScenario:
             email="a@example.com",
             password_hash="hash"
         )
-        for _ in range(10):
-            self.db.record_usage("iso-user-a", "email_summary", period_start, period_end)
+        with self.db.transaction():
+            for _ in range(10):
+                self.db.record_usage("iso-user-a", "email_summary", period_start, period_end)
 
         # ユーザーB
         self.db.create_user(
@@ -390,8 +396,9 @@ class TestE2EMultiUserScenario:
             email="b@example.com",
             password_hash="hash"
         )
-        for _ in range(5):
-            self.db.record_usage("iso-user-b", "email_summary", period_start, period_end)
+        with self.db.transaction():
+            for _ in range(5):
+                self.db.record_usage("iso-user-b", "email_summary", period_start, period_end)
 
         # 使用量が独立
         usage_a = self.db.get_usage("iso-user-a", "email_summary", period_start)
@@ -404,11 +411,10 @@ class TestE2EMultiUserScenario:
 class TestE2ESessionFlow:
     """E2E: セッションフロー"""
 
-    def test_typical_user_session(self):
+    def test_typical_user_session(self, mock_coordinator):
         """典型的なユーザーセッション"""
-        # 1. Coordinator初期化（モックLLM使用）
-        llm = create_llm_service(use_mock=True)
-        coordinator = Coordinator(llm_service=llm)
+        # 1. Coordinator（モックLLM使用）
+        coordinator = mock_coordinator
 
         # 2. ヘルプ確認
         result = coordinator.process_command("help")
@@ -441,26 +447,10 @@ class TestE2ESessionFlow:
 class TestE2EMonetizationCritical:
     """E2E: 収益化クリティカルパス"""
 
-    def test_free_to_paid_conversion(self):
+    def test_free_to_paid_conversion(self, db, billing, saturated_free_user):
         """無料→有料変換パス"""
-        billing = MockBillingService()
-        db = create_database()
-
-        # 1. 無料ユーザー作成
-        user = db.create_user(
-            user_id="convert-user",
-            email="convert@example.com",
-            password_hash="hash"
-        )
-        billing.create_subscription(
-            user_id=user.id,
-            customer_id=f"cus_{user.id}",
-            plan=SubscriptionPlan.FREE
-        )
-
-        # 2. 無料枠消費
-        for _ in range(50):
-            billing.record_usage(user.id, "email_summary")
+        # 1-2. 無料枠を使い切った無料ユーザー
+        user = saturated_free_user
 
         # 3. 上限到達を確認
         can_use, msg = billing.check_usage_limit(user.id, "email_summary")
@@ -479,37 +469,32 @@ class TestE2EMonetizationCritical:
         summary = billing.get_usage_summary(user.id)
         assert summary["plan"] == "personal"
 
-    def test_plan_limits_enforcement(self):
+    @pytest.mark.parametrize("plan,limit", [
+        (SubscriptionPlan.FREE, 50),
+        (SubscriptionPlan.PERSONAL, 500),
+        (SubscriptionPlan.PRO, 2000),
+    ], ids=["free", "personal", "pro"])
+    def test_plan_limits_enforcement(self, plan, limit):
         """プラン制限の強制"""
         billing = MockBillingService()
+        user_id = f"limit-test-{plan.value}"
+        billing.create_subscription(
+            user_id=user_id,
+            customer_id=f"cus_{user_id}",
+            plan=plan
+        )
+
+        # 制限未満は使用可能（上限の1回手前の状態を直接作る）
+        billing.set_usage(user_id, "email_summary", limit - 1)
 
-        # 各プランの制限テスト
-        plans = [
-            (SubscriptionPlan.FREE, 50),
-            (SubscriptionPlan.PERSONAL, 500),
-            (SubscriptionPlan.PRO, 2000),
-        ]
-
-        for plan, limit in plans:
-            user_id = f"limit-test-{plan.value}"
-            billing.create_subscription(
-                user_id=user_id,
-                customer_id=f"cus_{user_id}",
-                plan=plan
-            )
-
-            # 制限未満は使用可能
-            for _ in range(limit - 1):
-                billing.record_usage(user_id, "email_summary")
-
-            can_use, _ = billing.check_usage_limit(user_id, "email_summary")
-            assert can_use is True, f"Plan {plan.value}: should be usable before limit"
-
-            # 制限到達
-            billing.record_usage(user_id, "email_summary")
-            can_use, _ = billing.check_usage_limit(user_id, "email_summary")
-            assert can_use is False, f"Plan {plan.value}: should be blocked at limit"
+        can_use, _ = billing.check_usage_limit(user_id, "email_summary")
+        assert can_use is True, f"Plan {plan.value}: should be usable before limit"
 
+        # 制限到達
+        assert billing.record_usage(user_id, "email_summary") is True
+        can_use, _ = billing.check_usage_limit(user_id, "email_summary")
+        assert can_use is False, f"Plan {plan.value}: should be blocked at limit"
+        assert billing.record_usage(user_id, "email_summary") is False
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -112,24 +112,38 @@ class TestSchedulerEdgeCases:
         with pytest.raises(ScheduleError):
             scheduler.get_events()
 
-    def test_find_free_slots_offline(self):
-        """オフライン空き時間検索"""
+    @pytest.mark.parametrize("busy_count", [2, 10_000], ids=["two_meetings", "10k_slots"])
+    def test_find_free_slots_offline(self, busy_count):
+        """オフライン空き時間検索（総当たりの重複判定と結果が一致すること）"""
+        import random
         from src.scheduler import find_free_slots_offline, TimeSlot
 
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        busy = [
-            TimeSlot(today.replace(hour=10), today.replace(hour=11)),
-            TimeSlot(today.replace(hour=14), today.replace(hour=15)),
-        ]
+        if busy_count == 2:
+            busy = [
+                TimeSlot(today.replace(hour=14), today.replace(hour=15)),
+                TimeSlot(today.replace(hour=10), today.replace(hour=11)),
+            ]
+        else:
+            # 午前（9:00〜12:00）に短い予定を大量に詰め、午後は空けておく
+            rng = random.Random(0)
+            busy = []
+            for _ in range(busy_count):
+                start = today.replace(hour=9) + timedelta(minutes=rng.randrange(180))
+                busy.append(TimeSlot(start, start + timedelta(minutes=rng.randint(1, 5))))
 
         free = find_free_slots_offline(busy, duration_minutes=30)
 
         # 結果が存在すること
         assert len(free) > 0
-        # 忙しい時間と重複しないこと
-        for slot in free:
-            for b in busy:
-                assert not slot.overlaps(b)
+        # 全候補枠を総当たりで判定した結果と一致すること
+        day_start = today.replace(hour=9)
+        candidates = [
+            TimeSlot(day_start + timedelta(minutes=30 * i), day_start + timedelta(minutes=30 * i + 30))
+            for i in range(18)
+        ]
+        expected = [c for c in candidates if not any(c.overlaps(b) for b in busy)]
+        assert [(slot.start, slot.end) for slot in free] == [(c.start, c.end) for c in expected]
 
 
 class TestCoordinatorEdgeCases:
@@ -2,14 +2,10 @@
 EmailBot モジュールのテスト
 """
 
-import json
 import pytest
 from datetime import datetime
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.email_bot import (
     Email,
     EmailSummary,
@@ -121,13 +117,6 @@ class TestSummarizeTextOffline:
 class TestEmailBotOffline:
     """EmailBot（オフラインモード）のテスト"""
 
-    @pytest.fixture
-    def sample_emails(self):
-        """サンプルメールデータの読み込み"""
-        fixtures_path = Path(__file__).parent / "fixtures" / "sample_emails.json"
-        with open(fixtures_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
     def test_email_parsing_from_fixture(self, sample_emails):
         """フィクスチャからのメールパース"""
         email_data = sample_emails[0]
@@ -4,10 +4,6 @@ LLM モジュールのテスト
 
 import json
 import pytest
-from pathlib import Path
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.llm import (
     LLMProvider,
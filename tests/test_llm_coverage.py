@@ -11,12 +11,8 @@ LLM モジュールのカバレッジ向上テスト
 import json
 import os
 import pytest
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.llm import (
     LLMProvider,
     LLMConfig,
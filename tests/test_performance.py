@@ -211,9 +211,9 @@ class TestDatabasePerformance:
     """データベースのパフォーマンステスト"""
 
     @pytest.fixture
-    def database(self):
-        """インメモリデータベースのフィクスチャ"""
-        return Database()
+    def database(self, db):
+        """インメモリデータベースのフィクスチャ（セッション共有DB）"""
+        return db
 
     def test_user_insert_performance(self, database):
         """ユーザー挿入のパフォーマンス"""
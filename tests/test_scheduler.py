@@ -4,10 +4,6 @@ Scheduler モジュールのテスト
 
 import pytest
 from datetime import datetime, timedelta
-from pathlib import Path
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.scheduler import (
     TimeSlot,
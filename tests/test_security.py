@@ -12,7 +12,6 @@ from unittest.mock import MagicMock, patch
 
 from src.api import AuthService, User, FASTAPI_AVAILABLE
 from src.billing import BillingService, SubscriptionPlan, SubscriptionStatus
-from src.database import Database
 
 
 class TestPasswordSecurity:
@@ -213,9 +212,9 @@ class TestInputValidation:
         return AuthService(secret_key="input-validation-test")
 
     @pytest.fixture
-    def database(self):
-        """Databaseのフィクスチャ"""
-        return Database()
+    def database(self, db):
+        """Databaseのフィクスチャ（セッション共有DB）"""
+        return db
 
     def test_sql_injection_user_lookup(self, database):
         """SQLインジェクション攻撃を検証（ユーザー検索）"""
@@ -340,9 +339,9 @@ class TestDatabaseSecurity:
     """データベースセキュリティテスト"""
 
     @pytest.fixture
-    def database(self):
-        """Databaseのフィクスチャ"""
-        return Database()
+    def database(self, db):
+        """Databaseのフィクスチャ（セッション共有DB）"""
+        return db
 
     def test_user_isolation(self, database):
         """ユーザー間のデータ分離を検証"""